@@ -3,6 +3,12 @@ from .base import Base
 
 class Lemma(Base):
     __tablename__ = "lemmas"
+    # Unique on new databases; migrate_database.py keeps a plain index where existing rows
+    # hold duplicates, so code relying on uniqueness checks the live index (see
+    # ComprehensiveVocabularyProcessor._lemma_insert_statement) instead of this declaration
+    __table_args__ = (
+        Index("ix_lemmas_lemma_language", "lemma", "language", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     lemma = Column(String(100), nullable=False, index=True)
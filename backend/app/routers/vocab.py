@@ -3,6 +3,7 @@ import random
 import re
 from datetime import datetime
 from fastapi import APIRouter, HTTPException, Query, Depends, status, BackgroundTasks
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
 from typing import List, Optional, Tuple, Any, Dict
 from sqlalchemy.orm import Session
@@ -583,7 +584,9 @@ async def get_book_vocabulary(
     
     lemma_ids = [lemma.id for lemma, _ in lemmas_with_status]
     frequency_map = _build_frequency_map(db, book_id, lemma_ids)
-    vocabulary, lemmas_updated, pending_background = _build_vocabulary_items(
+    # Enrichment may call out to translation APIs; run it off the event loop
+    vocabulary, lemmas_updated, pending_background = await run_in_threadpool(
+        _build_vocabulary_items,
         lemmas_with_status,
         frequency_map,
         True,
@@ -701,7 +704,8 @@ async def get_swipe_session_vocabulary(
     ]
     updated_any = False
     for lemma in lemmas_needing_enrichment[:MAX_SYNC_ENRICHMENTS]:
-        definition, morphology, pos, changed = _enrich_lemma_if_needed(lemma, db)
+        # Dictionary lookups may block on the network; keep the event loop free
+        definition, morphology, pos, changed = await run_in_threadpool(_enrich_lemma_if_needed, lemma, db)
         if definition:
             lemma.definition = definition
         if morphology:
@@ -1,8 +1,14 @@
+import os
 import re
 import json
+import logging
 import requests
 from typing import Dict, List, Tuple, Optional, Set
+from bisect import bisect_right
 from collections import Counter, defaultdict
+from functools import lru_cache
+from itertools import islice
+from sqlalchemy import func, insert, inspect, update
 from sqlalchemy.orm import Session
 import sys
 sys.path.append('..')
@@ -16,17 +22,176 @@ from wordfreq import zipf_frequency
 import fuzzywuzzy
 from fuzzywuzzy import fuzz
 
+
+def _index_affixes(affixes) -> Tuple[Tuple[int, frozenset], ...]:
+    """Group affixes by length (shortest first) so a word needs one set probe per length."""
+    by_length = defaultdict(set)
+    for affix in affixes:
+        by_length[len(affix)].add(affix)
+    return tuple((length, frozenset(group)) for length, group in sorted(by_length.items()))
+
+
+def _match_prefixes(word: str, index) -> List[str]:
+    """Return every indexed prefix of word, shortest first."""
+    return [word[:length] for length, group in index if word[:length] in group]
+
+
+def _match_suffixes(word: str, index) -> List[str]:
+    """Return every indexed suffix of word, shortest first."""
+    return [word[-length:] for length, group in index if word[-length:] in group]
+
+
+def _longest_prefix(word: str, index) -> Optional[str]:
+    """Return the longest indexed prefix of word (probing longest lengths first), or None."""
+    for length, group in reversed(index):
+        if word[:length] in group:
+            return word[:length]
+    return None
+
+
+def _longest_suffix(word: str, index) -> Optional[str]:
+    """Return the longest indexed suffix of word (probing longest lengths first), or None."""
+    for length, group in reversed(index):
+        if word[-length:] in group:
+            return word[-length:]
+    return None
+
+
+# Affix tables for difficulty scoring and morphology breakdown, indexed once at import
+_COMPLEXITY_PREFIX_INDEX = _index_affixes([
+    'anti', 'auto', 'bio', 'co', 'con', 'de', 'dis', 'en', 'ex', 'in', 'mid', 'mis', 'non',
+    'over', 'pre', 're', 'sub', 'super', 'trans', 'un'
+])
+_COMPLEXITY_SUFFIX_INDEX = _index_affixes([
+    'able', 'al', 'ed', 'en', 'er', 'est', 'ful', 'hood', 'ing', 'ion', 'ish', 'ism', 'ist', 'ity',
+    'less', 'ly', 'ment', 'ness', 'ous', 'ship', 'sion', 'tion', 'ward', 'wise'
+])
+_MORPHOLOGY_PREFIX_INDEX = _index_affixes([
+    'anti', 'auto', 'bio', 'co', 'de', 'dis', 'en', 'ex', 'in', 'pre', 're', 'un'
+])
+_MORPHOLOGY_SUFFIX_INDEX = _index_affixes([
+    'able', 'al', 'ed', 'en', 'er', 'ful', 'ing', 'ion', 'ish', 'ism', 'ist', 'ity', 'less', 'ly',
+    'ment', 'ness', 'ous', 'sion', 'tion'
+])
+_DIACRITICS = frozenset('àèìòùáéíóúäëïöüßñç')
+
+logger = logging.getLogger(__name__)
+
+# Max bound parameters per `IN (...)` lookup, safely below SQLite/Postgres limits
+_IN_CLAUSE_CHUNK = 500
+
+# Pending lemma/token rows are written (flushed) every _WRITE_BATCH lemmas so new IDs
+# resolve and memory stays bounded; the transaction is committed, and book progress
+# published, only every _COMMIT_BATCH lemmas
+_WRITE_BATCH = 1000
+_COMMIT_BATCH = 10000
+# Pending tokens also force a write once this many pile up (very frequent words), and
+# every INSERT is issued in slices of _WRITE_CHUNK rows so memory stays bounded
+_MAX_PENDING_TOKENS = 50000
+_WRITE_CHUNK = 1000
+
+# Difficulty histogram: [0, 0.25) easy, [0.25, 0.5) medium, [0.5, 0.75) hard, [0.75, 1] very hard
+_DIFFICULTY_THRESHOLDS = (0.25, 0.5, 0.75)
+_DIFFICULTY_BIN_LABELS = ('easy', 'medium', 'hard', 'very_hard')
+
+# Very common function words that never need a dictionary lookup
+_SKIP_DICT_LOOKUP = {
+    'it': frozenset({'il', 'lo', 'la', 'i', 'gli', 'le', 'un', 'uno', 'una', 'di', 'a', 'da', 'in', 'con', 'su', 'per', 'e', 'che', 'è', 'sono'}),
+    'en': frozenset({'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'is', 'are', 'was', 'were'}),
+    'es': frozenset({'el', 'la', 'los', 'las', 'un', 'una', 'de', 'a', 'en', 'con', 'por', 'para'}),
+    'fr': frozenset({'le', 'la', 'les', 'un', 'une', 'de', 'à', 'dans', 'pour', 'avec'}),
+    'de': frozenset({'der', 'die', 'das', 'ein', 'eine', 'in', 'auf', 'an', 'mit'}),
+}
+
+# Grammatical category names that must never be stored as lemmas
+_CATEGORY_NAMES = frozenset({'article', 'preposition', 'conjunction', 'pronoun', 'adverb', 'adjective', 'noun', 'verb'})
+
+# Basic translation database used by _get_dictionary_translations (can be expanded).
+# Built once at import rather than on every lookup.
+_BUILTIN_TRANSLATIONS = {
+    'it': {
+        'il': 'the', 'la': 'the', 'è': 'is', 'di': 'of', 'a': 'to', 'e': 'and', 'per': 'for',
+        'libro': 'book', 'casa': 'house', 'mare': 'sea', 'mangiare': 'to eat', 'bere': 'to drink'
+    },
+    'en': {
+        'the': 'the', 'book': 'book', 'house': 'house', 'water': 'water'
+    }
+}
+# Flat (language, word) -> translation view: one hash lookup per query
+_BUILTIN_TRANSLATION_INDEX = {
+    (lang, word): translation
+    for lang, entries in _BUILTIN_TRANSLATIONS.items()
+    for word, translation in entries.items()
+}
+
+# Infinitive endings used to pick a canonical form: (non-reflexive, reflexive)
+_INFINITIVE_SUFFIXES = {
+    'it': (('are', 'ere', 'ire'), ('irsi', 'arsi', 'ersi')),
+    'es': (('ar', 'er', 'ir'), ()),
+    'fr': (('er', 'ir', 're'), ()),
+}
+
+# Sentence boundaries for context/statistics passes
+_SENT_SPLIT = re.compile(r'[.!?]+')
+
+
+def _morph_to_dict(morph) -> Dict[str, str]:
+    """Convert spaCy MorphAnalysis to a plain dict, only re-stringifying if needed."""
+    raw = morph.to_dict()
+    # spaCy already returns str -> str features; avoid rebuilding the dict in that case
+    if all(isinstance(v, str) for v in raw.values()):
+        return raw
+    return {str(k): str(v) for k, v in raw.items()}
+
+
+@lru_cache(maxsize=16)
+def _stop_words_for(language: str) -> frozenset:
+    """Load the NLTK stop word list for a language once per process."""
+    enhanced_stop_words = frozenset()
+    try:
+        import nltk
+        
+        # Ensure stopwords resource is present once
+        ensure_nltk_resource('stopwords', 'corpora/stopwords')
+        
+        from nltk.corpus import stopwords
+        
+        # Get stop words for the detected language
+        if language in stopwords.fileids():
+            enhanced_stop_words = frozenset(stopwords.words(language))
+            print(f"Using NLTK stop words for language: {language}")
+        else:
+            # Fallback to English
+            enhanced_stop_words = frozenset(stopwords.words('english'))
+            print(f"Using English NLTK stop words as fallback for: {language}")
+            
+    except Exception as e:
+        print(f"Could not load NLTK stop words: {e}")
+        print("Using basic stop words only")
+    
+    return enhanced_stop_words
+
+
 class ComprehensiveVocabularyProcessor:
     """Advanced vocabulary processor that extracts ALL words, groups families, and provides comprehensive analysis."""
     
-    def __init__(self):
+    def __init__(self, n_process: Optional[int] = None, min_token_frequency: Optional[int] = None):
+        """
+        Args:
+            n_process: Worker processes for spaCy chunk tokenization. Defaults to
+                min(4, cpu_count) when SPACY_PARALLEL=1 is set, otherwise 1 (fork-based
+                workers do not play well with GPU/threaded deployments).
+            min_token_frequency: Words seen fewer times in a book are saved as lemmas but
+                get no token rows. Defaults to MIN_TOKEN_FREQUENCY or 1 (keep every token);
+                2 drops the hapax long tail, roughly halving token inserts, but those words
+                then don't show up in the book's vocabulary.
+        """
         self.book_processor = BookMetadataExtractor()
         self.p = inflect.engine()
         self.nlp_tools = self.book_processor.nlp_tools
         
         # Cache expensive NLP resources so uploads do not pay load cost repeatedly
         self._spacy_models = {}
-        self._enhanced_stop_words_cache = {}
         self._spacy_disabled_components = ["parser", "ner", "textcat"]
         self._spacy_model_names = {
             'en': 'en_core_web_sm',
@@ -35,6 +200,15 @@ class ComprehensiveVocabularyProcessor:
             'fr': 'fr_core_news_sm',
             'de': 'de_core_news_sm',
         }
+        if n_process is None:
+            n_process = min(4, os.cpu_count() or 1) if self._spacy_parallel_enabled() else 1
+        self.n_process = max(1, n_process)
+        if min_token_frequency is None:
+            min_token_frequency = self._min_token_frequency_from_env()
+        self.min_token_frequency = max(1, min_token_frequency)
+        # Whether the lemmas table has the unique (lemma, language) index needed for
+        # INSERT ... ON CONFLICT; probed once on first write
+        self._lemma_upsert_supported = None
         
         # Create comprehensive word database for different languages
         self.language_patterns = {
@@ -45,12 +219,41 @@ class ComprehensiveVocabularyProcessor:
             'de': self._german_patterns
         }
         
+        # Suffix-stripping endings per language, longest first (static, so sort once)
+        self._sorted_endings = {
+            lang: self._build_sorted_endings(patterns_fn())
+            for lang, patterns_fn in self.language_patterns.items()
+        }
+        # Same endings as a plain tuple for a single C-level str.endswith() pre-check
+        self._endings_tuples = {
+            lang: tuple(ending for ending, _ in sorted_endings)
+            for lang, sorted_endings in self._sorted_endings.items()
+        }
+        
         # Translation cache
         self.translation_cache = {}
         
         # Word family patterns (will be expanded with linguistic analysis)
         self.word_families = {}
     
+    @staticmethod
+    def _min_token_frequency_from_env() -> int:
+        """Read MIN_TOKEN_FREQUENCY, falling back to 1 (store every token)."""
+        value = os.getenv("MIN_TOKEN_FREQUENCY")
+        if value is None:
+            return 1
+        try:
+            return max(1, int(value))
+        except ValueError:
+            print(f"Invalid value '{value}' for MIN_TOKEN_FREQUENCY, using default 1")
+            return 1
+    
+    @staticmethod
+    def _spacy_parallel_enabled() -> bool:
+        """Check env flag to see if spaCy may fan chunk processing out to worker processes."""
+        flag = os.getenv("SPACY_PARALLEL", "")
+        return flag.lower() in {"1", "true", "yes"}
+    
     def _get_spacy_model(self, language: str):
         """
         Load and cache spaCy models with heavy pipeline components disabled.
@@ -74,6 +277,15 @@ class ComprehensiveVocabularyProcessor:
         except OSError:
             return None
         
+    @staticmethod
+    def _build_sorted_endings(patterns: Dict) -> Tuple[Tuple[str, int], ...]:
+        """Flatten verb endings from a pattern table into (ending, len) pairs, longest first."""
+        endings = []
+        verb_endings = patterns.get('verb_endings', {})
+        for group in ('are', 'ere', 'ire', 'ing', 'ed', 's'):
+            endings.extend(verb_endings.get(group, []))
+        return tuple((ending, len(ending)) for ending in sorted(endings, key=len, reverse=True))
+    
     def _italian_patterns(self) -> Dict[str, List[str]]:
         """Italian morphological patterns for word family grouping."""
         return {
@@ -133,20 +345,26 @@ class ComprehensiveVocabularyProcessor:
         # Get enhanced stop words from NLP libraries
         enhanced_stop_words = self._get_enhanced_stop_words(language)
         
-        # Extract ALL words without filtering
-        all_words = self._extract_all_words(text, language)
+        # Extract ALL words without filtering, as (word, is_alpha) pairs
+        word_pairs = self._extract_all_words(text, language)
+        all_words = [word for word, _ in word_pairs]
+        # Lowercase every token exactly once; all loops below share this list
+        lowered_words = list(map(str.lower, all_words))
         
         # Group words into families
-        word_families = self._group_word_families(all_words, language)
+        word_families = self._group_word_families(all_words, language, lowered_words)
         
-        # OPTIMIZED: Count frequencies efficiently using Counter
-        word_counter = Counter(word.lower() for word in all_words if word.isalpha() and len(word) >= 2)
-        
-        # OPTIMIZED: Build positions map efficiently
+        # OPTIMIZED: Count frequencies, positions and first original form in one pass
+        word_counter = Counter()
         positions_map = defaultdict(list)
-        for i, word in enumerate(all_words):
-            word_lower = word.lower()
-            if word.isalpha() and len(word) >= 2 and word_lower not in enhanced_stop_words:
+        first_original = {}
+        for i, ((word, is_alpha), word_lower) in enumerate(zip(word_pairs, lowered_words)):
+            if word_lower not in first_original:
+                first_original[word_lower] = word
+            if not is_alpha or len(word) < 2:
+                continue
+            word_counter[word_lower] += 1
+            if word_lower not in enhanced_stop_words:
                 positions_map[word_lower].append(i)
         
         # OPTIMIZED: Analyze words in batch - skip expensive operations
@@ -159,10 +377,11 @@ class ComprehensiveVocabularyProcessor:
                 continue
             
             # Get original form (first occurrence)
-            original = next((w for w in all_words if w.lower() == word_lower), word_lower)
+            original = first_original.get(word_lower, word_lower)
             
             word_analysis[word_lower] = {
                 'original': original,
+                '_lower': word_lower,  # Normalized key, reused by the save path
                 'frequency': frequency,
                 'positions': positions_map.get(word_lower, [])[:100],  # Limit positions to 100
                 'language': language,
@@ -175,12 +394,15 @@ class ComprehensiveVocabularyProcessor:
             }
             total_vocabulary_count += 1
         
+        # Split the text into sentences/words once; stats and contexts reuse the lists
+        text_parts = self._split_text(text)
+        
         # Get comprehensive statistics
-        stats = self._calculate_comprehensive_stats(text, word_analysis, language)
+        stats = self._calculate_comprehensive_stats(text, word_analysis, language, text_parts)
         
         # Calculate total_words from original text (count ALL tokens, including single-char words)
         # This matches the word_count calculation in book_processor.extract_text()
-        total_words_count = len(text.split())
+        total_words_count = len(text_parts['words'])
         
         return {
             "total_words": total_words_count,
@@ -192,16 +414,20 @@ class ComprehensiveVocabularyProcessor:
             "complexity_metrics": nlp_analysis
         }
     
-    def _extract_all_words(self, text: str, language: str) -> List[str]:
-        """Extract ALL words from text without filtering. Improved to prevent broken words."""
+    def _extract_all_words(self, text: str, language: str) -> List[Tuple[str, bool]]:
+        """
+        Extract ALL words from text without filtering. Improved to prevent broken words.
+        Returns (word, is_alpha) pairs so callers can reuse spaCy's is_alpha flag.
+        """
         nlp = self._get_spacy_model(language)
         if nlp:
             # Process in chunks to avoid memory issues
             words = []
             chunk_size = 10000  # Process 10k chars at a time
-            for i in range(0, len(text), chunk_size):
-                chunk = text[i:i+chunk_size]
-                doc = nlp(chunk)
+            chunks = (text[i:i+chunk_size] for i in range(0, len(text), chunk_size))
+            # Chunks are independent, so spaCy can spread them across worker processes.
+            # Only text/is_alpha/pos_ are read below, so the lemmatizer can be skipped too.
+            for doc in nlp.pipe(chunks, n_process=self.n_process, batch_size=4, disable=["lemmatizer"]):
                 # Handle Italian/French contractions that may be split by spaCy
                 # Merge tokens like "nell'" + "'" + "estate" back to "nell'estate"
                 tokens = list(doc)
@@ -216,10 +442,11 @@ class ComprehensiveVocabularyProcessor:
                         # Merge contraction: "nell'" + "'" + "estate" -> "nell'estate"
                         merged = token.text + "'" + tokens[j+2].text
                         # Preserve capitalization for proper nouns
+                        # Contractions keep the apostrophe, so they are never is_alpha
                         if token.pos_ == 'PROPN' or tokens[j+2].pos_ == 'PROPN':
-                            words.append(merged.strip())
+                            words.append((merged.strip(), False))
                         else:
-                            words.append(merged.lower().strip())
+                            words.append((merged.lower().strip(), False))
                         j += 3
                     elif not token.is_punct and not token.is_space:
                         # Regular token - include if it's alphabetic or contains apostrophe
@@ -230,14 +457,11 @@ class ComprehensiveVocabularyProcessor:
                         else:
                             token_text = token.text.lower().strip()
                         if len(token_text.replace("'", "")) >= 2 and (token.is_alpha or "'" in token_text):
-                            words.append(token_text)
+                            words.append((token_text, token.is_alpha))
                         j += 1
                     else:
                         j += 1
-            # Fix incorrectly split words from PDF extraction (e.g., "pubbl icato" -> "pubblicato")
-            words = self._merge_split_words(words, language)
-            words = self._filter_suffix_fragments(words, language)
-            return words
+            return self._repair_word_pairs(words, language)
         
         # Fallback: regex-based extraction (improved to preserve word boundaries)
         # Preserve capitalization for proper nouns - don't lowercase the entire text
@@ -272,7 +496,19 @@ class ComprehensiveVocabularyProcessor:
         words = self._merge_split_words(words, language)
         words = self._filter_suffix_fragments(words, language)
         
-        return words
+        return [(word, word.isalpha()) for word in words]
+    
+    def _repair_word_pairs(self, pairs: List[Tuple[str, bool]], language: str) -> List[Tuple[str, bool]]:
+        """
+        Apply split-word merging and suffix-fragment filtering to (word, is_alpha) pairs.
+        Both repairs are Italian-only, so other languages keep the tokenizer's flags untouched.
+        """
+        if language != 'it':
+            return pairs
+        # Fix incorrectly split words from PDF extraction (e.g., "pubbl icato" -> "pubblicato")
+        words = self._merge_split_words([word for word, _ in pairs], language)
+        words = self._filter_suffix_fragments(words, language)
+        return [(word, word.isalpha()) for word in words]
     
     def _merge_split_words(self, words: List[str], language: str) -> List[str]:
         """
@@ -397,21 +633,25 @@ class ComprehensiveVocabularyProcessor:
             filtered.append(word)
         return filtered
     
-    def _group_word_families(self, words: List[str], language: str) -> Dict[str, str]:
+    def _group_word_families(self, words: List[str], language: str, lowered_words: Optional[List[str]] = None) -> Dict[str, str]:
         """
         Group words into families based on morphological patterns.
         Returns word -> root mapping, NOT word -> category mapping.
         This is used for grouping conjugations/forms, not for categorizing words.
+        Pass `lowered_words` (parallel to `words`) to reuse already-lowercased tokens.
         """
         word_families = {}
-        word_counts = Counter(words)
+        if lowered_words is None:
+            lowered_words = list(map(str.lower, words))
+        # Unique word -> lowercase form (dict keeps first-seen order like Counter did)
+        unique_words = dict(zip(words, lowered_words))
         
         patterns = self.language_patterns.get(language, self._english_patterns)()
         
-        for word, count in word_counts.items():
+        for word, word_lower in unique_words.items():
             # Don't assign category names - just find the root/lemma
             # The root should be an actual word form, not a category name
-            family = self._find_word_family_root(word, language, patterns)
+            family = self._find_word_family_root(word_lower, language, patterns)
             # Ensure we never return category names - always return a word form
             if family in ['article', 'preposition', 'conjunction', 'pronoun']:
                 # If we got a category, just use the word itself
@@ -422,25 +662,22 @@ class ComprehensiveVocabularyProcessor:
         return word_families
     
     def _find_word_family_root(self, word: str, language: str, patterns: Dict) -> str:
-        """Find the root of a word family using morphological analysis."""
-        word = word.lower()
-        
-        # Remove common endings to find root
-        endings = []
-        if 'verb_endings' in patterns:
-            endings.extend(patterns['verb_endings'].get('are', []))
-            endings.extend(patterns['verb_endings'].get('ere', []))
-            endings.extend(patterns['verb_endings'].get('ire', []))
-            endings.extend(patterns['verb_endings'].get('ing', []))
-            endings.extend(patterns['verb_endings'].get('ed', []))
-            endings.extend(patterns['verb_endings'].get('s', []))
-        
-        # Try removing endings
-        for ending in sorted(endings, key=len, reverse=True):
-            if word.endswith(ending) and len(word) > len(ending):
-                root = word[:-len(ending)]
-                if len(root) >= 2:  # Keep root if it's meaningful
-                    return root
+        """Find the root of a word family using morphological analysis. Expects a lowercased word."""
+        # Remove common endings to find root (pre-sorted longest first in __init__)
+        sorted_endings = self._sorted_endings.get(language)
+        endings_tuple = self._endings_tuples.get(language)
+        if sorted_endings is None:
+            sorted_endings = self._build_sorted_endings(patterns)
+            endings_tuple = tuple(ending for ending, _ in sorted_endings)
+        
+        # Try removing endings - most words match none, so check all at once first
+        if endings_tuple and word.endswith(endings_tuple):
+            word_len = len(word)
+            for ending, ending_len in sorted_endings:
+                if word.endswith(ending) and word_len > ending_len:
+                    root = word[:-ending_len]
+                    if len(root) >= 2:  # Keep root if it's meaningful
+                        return root
         
         # Use fuzzy matching to find similar roots
         potential_roots = set()
@@ -584,15 +821,9 @@ class ComprehensiveVocabularyProcessor:
         except Exception as e:
             print(f"Translation failed for {word}: {e}")
         
-        # Clean and deduplicate translations - filter out morphological info
-        cleaned_translations = []
-        for t in translations:
-            t_str = t.strip()
-            # Skip morphological variations
-            if t_str and not t_str.startswith(('plural:', 'feminine:', 'masculine:')):
-                cleaned_translations.append(t_str)
-        
-        cleaned_translations = list(set(cleaned_translations))
+        # Clean and deduplicate translations, keeping first-seen order.
+        # Neither producer above emits morphological info ('plural:' etc.), so no filter is needed.
+        cleaned_translations = list(dict.fromkeys(t.strip() for t in translations if t.strip()))
         
         self.translation_cache[cache_key] = cleaned_translations
         return cleaned_translations
@@ -624,19 +855,9 @@ class ComprehensiveVocabularyProcessor:
         """Get translations using common dictionary patterns."""
         translations = []
         
-        # Basic translation database (can be expanded)
-        translation_db = {
-            'it': {
-                'il': 'the', 'la': 'the', 'è': 'is', 'di': 'of', 'a': 'to', 'e': 'and', 'per': 'for',
-                'libro': 'book', 'casa': 'house', 'mare': 'sea', 'mangiare': 'to eat', 'bere': 'to drink'
-            },
-            'en': {
-                'the': 'the', 'book': 'book', 'house': 'house', 'water': 'water'
-            }
-        }
-        
-        if word.lower() in translation_db.get(target_language, {}):
-            translations.append(translation_db[target_language][word.lower()])
+        translation = _BUILTIN_TRANSLATION_INDEX.get((target_language, word.lower()))
+        if translation is not None:
+            translations.append(translation)
         
         return translations
     
@@ -698,25 +919,18 @@ class ComprehensiveVocabularyProcessor:
     def _calculate_morphological_complexity(self, word: str, language: str) -> float:
         """Calculate morphological complexity of a word."""
         complexity = 0.0
+        word_lower = word.lower()
         
-        # Check for affixes
-        prefixes = ['anti', 'auto', 'bio', 'co', 'con', 'de', 'dis', 'en', 'ex', 'in', 'mid', 'mis', 'non', 'over', 'pre', 're', 'sub', 'super', 'trans', 'un']
-        suffixes = ['able', 'al', 'ed', 'en', 'er', 'est', 'ful', 'hood', 'ing', 'ion', 'ish', 'ism', 'ist', 'ity', 'less', 'ly', 'ment', 'ness', 'ous', 'ship', 'sion', 'tion', 'ward', 'wise']
-        
-        for prefix in prefixes:
-            if word.lower().startswith(prefix):
-                complexity += 0.2
-        
-        for suffix in suffixes:
-            if word.lower().endswith(suffix):
-                complexity += 0.2
+        # Check for affixes (one set probe per affix length instead of one scan per affix)
+        complexity += 0.2 * len(_match_prefixes(word_lower, _COMPLEXITY_PREFIX_INDEX))
+        complexity += 0.2 * len(_match_suffixes(word_lower, _COMPLEXITY_SUFFIX_INDEX))
         
         # Check for compound words (simple heuristic)
-        if word.lower().count('-') > 0:
+        if '-' in word_lower:
             complexity += 0.3
         
         # Check for special characters
-        special_chars = len(re.findall(r'[àèìòùáéíóúäëïöüßñç]', word.lower()))
+        special_chars = sum(1 for ch in word_lower if ch in _DIACRITICS)
         complexity += special_chars * 0.1
         
         return min(complexity, 1.0)
@@ -743,7 +957,7 @@ class ComprehensiveVocabularyProcessor:
     def _extract_contexts(self, word: str, text: str) -> List[str]:
         """Extract context sentences containing the word."""
         contexts = []
-        sentences = re.split(r'[.!?]+', text)
+        sentences = _SENT_SPLIT.split(text)
         
         for sentence in sentences:
             if word.lower() in sentence.lower():
@@ -751,6 +965,13 @@ class ComprehensiveVocabularyProcessor:
         
         return contexts[:5]  # Limit to first 5 contexts
     
+    def _split_text(self, text: str) -> Dict[str, List[str]]:
+        """Split text into sentences and whitespace words once for all downstream passes."""
+        return {
+            'sentences': _SENT_SPLIT.split(text),
+            'words': text.split(),
+        }
+    
     def _analyze_morphology(self, word: str, language: str) -> Dict:
         """Analyze morphological features of a word."""
         morphology = {
@@ -764,30 +985,36 @@ class ComprehensiveVocabularyProcessor:
         # Simple morphological analysis
         word_lower = word.lower()
         
-        # Check for common affixes
-        prefixes = ['anti', 'auto', 'bio', 'co', 'de', 'dis', 'en', 'ex', 'in', 'pre', 're', 'un']
-        suffixes = ['able', 'al', 'ed', 'en', 'er', 'ful', 'ing', 'ion', 'ish', 'ism', 'ist', 'ity', 'less', 'ly', 'ment', 'ness', 'ous', 'sion', 'tion']
-        
-        for prefix in prefixes:
-            if word_lower.startswith(prefix):
-                morphology['prefixes'].append(prefix)
-                morphology['root'] = word_lower[len(prefix):]
+        # Check for common affixes - only the longest match counts ("tion", not also "ion")
+        prefix = _longest_prefix(word_lower, _MORPHOLOGY_PREFIX_INDEX)
+        if prefix:
+            morphology['prefixes'].append(prefix)
+            morphology['root'] = word_lower[len(prefix):]
         
-        for suffix in suffixes:
-            if word_lower.endswith(suffix):
-                morphology['suffixes'].append(suffix)
-                morphology['root'] = word_lower[:-len(suffix)]
+        suffix = _longest_suffix(word_lower, _MORPHOLOGY_SUFFIX_INDEX)
+        if suffix:
+            morphology['suffixes'].append(suffix)
+            morphology['root'] = word_lower[:-len(suffix)]
         
         return morphology
     
-    def _calculate_comprehensive_stats(self, text: str, vocabulary: Dict, language: str) -> Dict:
+    def _calculate_comprehensive_stats(
+        self,
+        text: str,
+        vocabulary: Dict,
+        language: str,
+        text_parts: Optional[Dict[str, List[str]]] = None
+    ) -> Dict:
         """Calculate comprehensive statistics for the text."""
+        if text_parts is None:
+            text_parts = self._split_text(text)
+        total_words = len(text_parts['words'])
         stats = {
-            'total_words': len(text.split()),
+            'total_words': total_words,
             'unique_words': len(vocabulary),
             'vocabulary_density': 0,
             'average_word_length': 0,
-            'sentence_count': len(re.split(r'[.!?]+', text)) - 1,
+            'sentence_count': len(text_parts['sentences']) - 1,
             'difficulty_distribution': {
                 'easy': 0,
                 'medium': 0,
@@ -801,77 +1028,54 @@ class ComprehensiveVocabularyProcessor:
         }
         
         # Calculate vocabulary density
-        stats['vocabulary_density'] = len(vocabulary) / len(text.split()) if text.split() else 0
+        stats['vocabulary_density'] = len(vocabulary) / total_words if total_words else 0
         
         # Calculate average word length
         if vocabulary:
             total_length = sum(len(word) for word in vocabulary.keys())
             stats['average_word_length'] = total_length / len(vocabulary)
         
-        # Analyze difficulty distribution
-        for word_data in vocabulary.values():
-            difficulty = word_data.get('difficulty', 0)
-            if difficulty < 0.25:
-                stats['difficulty_distribution']['easy'] += 1
-            elif difficulty < 0.5:
-                stats['difficulty_distribution']['medium'] += 1
-            elif difficulty < 0.75:
-                stats['difficulty_distribution']['hard'] += 1
-            else:
-                stats['difficulty_distribution']['very_hard'] += 1
-        
-        # Analyze word families
+        # Analyze difficulty distribution, word families and POS in a single pass
+        # (difficulty bin index = number of thresholds <= difficulty)
+        bin_counts = [0] * len(_DIFFICULTY_BIN_LABELS)
         family_counts = Counter()
         pos_counts = Counter()
         
         for word_data in vocabulary.values():
-            family = word_data.get('family', 'unknown')
-            pos = word_data.get('grammar', {}).get('part_of_speech', 'UNKNOWN')
-            
-            family_counts[family] += 1
-            pos_counts[pos] += 1
+            bin_counts[bisect_right(_DIFFICULTY_THRESHOLDS, word_data.get('difficulty', 0))] += 1
+            family_counts[word_data.get('family', 'unknown')] += 1
+            pos_counts[word_data.get('grammar', {}).get('part_of_speech', 'UNKNOWN')] += 1
         
+        stats['difficulty_distribution'] = dict(zip(_DIFFICULTY_BIN_LABELS, bin_counts))
         stats['word_families'] = dict(family_counts.most_common(10))
         stats['parts_of_speech'] = dict(pos_counts.most_common(10))
         
         return stats
     
-    def _get_enhanced_stop_words(self, language: str) -> set:
-        """Get enhanced stop words using NLTK."""
-        if language in self._enhanced_stop_words_cache:
-            return self._enhanced_stop_words_cache[language]
-        
-        enhanced_stop_words = set()
-        
-        if 'nltk' in self.nlp_tools:
-            try:
-                import nltk
-                
-                # Ensure stopwords resource is present once
-                ensure_nltk_resource('stopwords', 'corpora/stopwords')
-                
-                from nltk.corpus import stopwords
-                
-                # Get stop words for the detected language
-                if language in stopwords.fileids():
-                    enhanced_stop_words = set(stopwords.words(language))
-                    print(f"Using NLTK stop words for language: {language}")
-                else:
-                    # Fallback to English
-                    enhanced_stop_words = set(stopwords.words('english'))
-                    print(f"Using English NLTK stop words as fallback for: {language}")
-                    
-            except Exception as e:
-                print(f"Could not load NLTK stop words: {e}")
-                print("Using basic stop words only")
-        
-        self._enhanced_stop_words_cache[language] = enhanced_stop_words
-        return enhanced_stop_words
+    def _get_enhanced_stop_words(self, language: str) -> frozenset:
+        """
+        Get enhanced stop words using NLTK (loaded once per language per process).
+        Returned as a frozenset: it is shared via the cache, so callers must not mutate it.
+        """
+        if 'nltk' not in self.nlp_tools:
+            return frozenset()
+        return _stop_words_for(language)
     
     def save_comprehensive_analysis(self, analysis: Dict, book_id: int, db: Session):
         """Save comprehensive vocabulary analysis to database."""
+        vocabulary = analysis['vocabulary']
+        
+        # Load every existing lemma for this vocabulary up front (chunked IN queries)
+        # instead of one SELECT per word
+        keys = list({data['original'] for data in vocabulary.values()})
+        existing_by_lemma = {}
+        for i in range(0, len(keys), _IN_CLAUSE_CHUNK):
+            for row in db.query(Lemma).filter(Lemma.lemma.in_(keys[i:i + _IN_CLAUSE_CHUNK])).all():
+                existing_by_lemma.setdefault(row.lemma, row)
+        
         # Save enhanced lemmas
-        for word, data in analysis['vocabulary'].items():
+        new_records = []
+        for word, data in vocabulary.items():
             lemma_record = Lemma(
                 lemma=data['original'],
                 language=data['language'],
@@ -882,8 +1086,7 @@ class ComprehensiveVocabularyProcessor:
                 difficulty_level=data.get('difficulty', 0.5)
             )
             
-            # Check if exists
-            existing = db.query(Lemma).filter(Lemma.lemma == data['original']).first()
+            existing = existing_by_lemma.get(data['original'])
             if existing:
                 # Update existing
                 existing.pos = lemma_record.pos
@@ -893,26 +1096,149 @@ class ComprehensiveVocabularyProcessor:
                 existing.difficulty_level = lemma_record.difficulty_level
             else:
                 # Add new
-                db.add(lemma_record)
+                new_records.append(lemma_record)
         
+        if new_records:
+            db.bulk_save_objects(new_records)
         db.commit()
         print(f"Saved {len(analysis['vocabulary'])} vocabulary entries")
     
+    def _load_existing_lemmas(self, db: Session, keys, language: str) -> Dict[str, Lemma]:
+        """Fetch existing Lemma rows for many lemma strings using chunked IN queries."""
+        keys = list(keys)
+        existing = {}
+        for i in range(0, len(keys), _IN_CLAUSE_CHUNK):
+            rows = db.query(Lemma).filter(
+                Lemma.language == language,
+                Lemma.lemma.in_(keys[i:i + _IN_CLAUSE_CHUNK])
+            ).all()
+            for row in rows:
+                existing.setdefault(row.lemma, row)
+        return existing
+    
+    def _write_pending_records(self, db: Session, lemma_records: List[Dict], token_records: List[Dict],
+                               token_to_new_key: Dict[str, str], new_lemma_ids: Dict[str, int], language: str,
+                               dictionary_service=None) -> int:
+        """
+        Insert pending lemmas, then their tokens, in _WRITE_CHUNK-row slices (no commit).
+        
+        Both lists are emptied in place. Returns the number of tokens written.
+        """
+        from ..models.lemma import Token
+        
+        # First flush pending lemmas to get IDs
+        if lemma_records:
+            lemma_insert = self._lemma_insert_statement(db)
+            # RETURNING with executemany is only available on some backends (not e.g. MySQL)
+            use_returning = getattr(db.get_bind().dialect, 'insert_executemany_returning', False)
+            if use_returning:
+                lemma_insert = lemma_insert.returning(Lemma.id, Lemma.lemma)
+            for i in range(0, len(lemma_records), _WRITE_CHUNK):
+                chunk = lemma_records[i:i + _WRITE_CHUNK]
+                # Plain dict rows go to multi-row INSERTs (SQLAlchemy 2.0 insertmanyvalues);
+                # RETURNING hands back the new IDs in the same round trip
+                result = db.execute(lemma_insert, chunk)
+                if use_returning:
+                    new_lemma_ids.update({lemma_text: id_ for id_, lemma_text in result})
+                else:
+                    # Re-query the IDs of the rows just written (one IN query per chunk)
+                    rows = db.query(Lemma.id, Lemma.lemma).filter(
+                        Lemma.language == language,
+                        Lemma.lemma.in_([record['lemma'] for record in chunk]),
+                    ).all()
+                    new_lemma_ids.update({lemma_text: id_ for id_, lemma_text in rows})
+            if dictionary_service:
+                dictionary_service.invalidate_lemma_cache([lr['lemma'] for lr in lemma_records], language)
+            self._resolve_token_lemma_ids(token_records, token_to_new_key, new_lemma_ids)
+            lemma_records.clear()
+        
+        # Filter out tokens without lemma_id
+        valid_tokens = [tr for tr in token_records if tr['lemma_id'] is not None]
+        for i in range(0, len(valid_tokens), _WRITE_CHUNK):
+            db.execute(insert(Token), valid_tokens[i:i + _WRITE_CHUNK])
+        token_records.clear()
+        return len(valid_tokens)
+    
+    def _lemma_insert_statement(self, db: Session):
+        """
+        INSERT for new lemma rows. On PostgreSQL/SQLite with the unique (lemma, language)
+        index it upserts, so a row written concurrently (e.g. another book processed at
+        the same time) is updated in the same statement instead of failing the batch.
+        """
+        bind = db.get_bind()
+        dialect = bind.dialect.name
+        if dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+            greatest = func.greatest
+        elif dialect == 'sqlite':
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+            greatest = func.max  # SQLite's multi-argument max() is scalar
+        else:
+            return insert(Lemma)
+        
+        if self._lemma_upsert_supported is None:
+            try:
+                self._lemma_upsert_supported = any(
+                    index.get('unique') and index.get('column_names') == ['lemma', 'language']
+                    for index in inspect(bind).get_indexes(Lemma.__tablename__)
+                )
+            except Exception as e:
+                print(f"Could not inspect lemma indexes, using plain INSERT: {e}")
+                self._lemma_upsert_supported = False
+        if not self._lemma_upsert_supported:
+            return insert(Lemma)
+        
+        stmt = dialect_insert(Lemma)
+        excluded = stmt.excluded
+        # Same rules as updating a prefetched row: keep stored pos/definition when
+        # the new value is empty, never lower the frequency
+        return stmt.on_conflict_do_update(
+            index_elements=['lemma', 'language'],
+            set_={
+                'pos': func.coalesce(func.nullif(excluded.pos, ''), Lemma.pos),
+                'definition': func.coalesce(func.nullif(excluded.definition, ''), Lemma.definition),
+                'morphology': excluded.morphology,
+                'global_frequency': greatest(func.coalesce(Lemma.global_frequency, 0), excluded.global_frequency),
+            },
+        )
+    
+    def _resolve_token_lemma_ids(self, token_records: List[Dict], token_to_new_key: Dict[str, str], new_lemma_ids: Dict[str, int]):
+        """Fill in lemma_id for tokens whose lemma was inserted after they were collected."""
+        for tr in token_records:
+            if tr['lemma_id'] is None:
+                tr['lemma_id'] = new_lemma_ids.get(token_to_new_key.get(tr['original_token']))
+    
     def save_comprehensive_analysis_with_lemmatization(
         self, 
         analysis: Dict, 
         book_id: int, 
         language: str, 
         db: Session,
-        dictionary_service=None  # Optional - not used anymore for speed
+        dictionary_service=None  # Optional - used for DB-first lookups and word normalization
     ):
         """
         Save vocabulary analysis with proper lemmatization using spaCy.
         Groups words with same root/conjugation together.
         OPTIMIZED: Batch processes text with spaCy for much faster processing.
         """
-        from ..models.lemma import Token
-        
+        # Prefetched lemma rows are kept across the periodic commits, so don't expire
+        # (and reload row by row) them on each one; restored for the caller afterwards
+        expire_on_commit = db.expire_on_commit
+        db.expire_on_commit = False
+        try:
+            return self._save_comprehensive_analysis(analysis, book_id, language, db, dictionary_service)
+        finally:
+            db.expire_on_commit = expire_on_commit
+    
+    def _save_comprehensive_analysis(
+        self,
+        analysis: Dict,
+        book_id: int,
+        language: str,
+        db: Session,
+        dictionary_service=None
+    ):
+        """Body of save_comprehensive_analysis_with_lemmatization (runs with expire_on_commit off)."""
         # Try to use spaCy for proper lemmatization
         model_name = self._spacy_model_names.get(language, 'en_core_web_sm')
         spacy_nlp = self._get_spacy_model(language)
@@ -928,72 +1254,84 @@ class ComprehensiveVocabularyProcessor:
         # Create a mapping of word -> spaCy info using batch processing
         word_to_spacy = {}
         if spacy_nlp:
-            # Process words in batches to avoid memory issues
-            batch_size = 1000
-            for i in range(0, len(unique_words), batch_size):
-                batch = unique_words[i:i+batch_size]
-                try:
-                    for doc in spacy_nlp.pipe(batch, batch_size=128):
-                        if not doc:
-                            continue
-                        token = doc[0]  # Each entry is a single word
-                        word_lower = token.text.lower().strip()
-                        if word_lower in unique_words:
-                            # Preserve original capitalization for proper nouns
-                            word_original = token.text.strip()
-                            lemma = token.lemma_.lower().strip() if token.lemma_ else word_lower
-                            # For proper nouns, preserve capitalization in lemma too
-                            if token.pos_ == 'PROPN' and token.lemma_:
-                                lemma = token.lemma_.strip()
+            # Each input is a single word, so docs line up 1:1 with unique_words.
+            # The cached model already has parser/ner/textcat disabled.
+            try:
+                docs = spacy_nlp.pipe(unique_words, batch_size=1000, n_process=self.n_process)
+                for word_lower, doc in zip(unique_words, docs):
+                    if not doc:
+                        continue
+                    token = doc[0]
+                    # Preserve original capitalization for proper nouns
+                    word_original = token.text.strip()
+                    lemma = token.lemma_.lower().strip() if token.lemma_ else word_lower
+                    # For proper nouns, preserve capitalization in lemma too
+                    if token.pos_ == 'PROPN' and token.lemma_:
+                        lemma = token.lemma_.strip()
+                    morph_dict = {}
+                    if token.morph:
+                        morph_dict = _morph_to_dict(token.morph)
+                    word_to_spacy[word_lower] = {
+                        'pos': token.pos_,
+                        'tag': token.tag_,
+                        'morph': morph_dict,
+                        'lemma': lemma if lemma else word_lower,
+                        'original': word_original  # Store original capitalization
+                    }
+            except Exception as e:
+                print(f"Error batch processing words: {e}")
+                # Fallback to individual processing for words the batch did not reach
+                for word in unique_words:
+                    if word.lower() in word_to_spacy:
+                        continue
+                    try:
+                        doc = spacy_nlp(word.lower())
+                        if len(doc) > 0:
+                            token = doc[0]
+                            lemma = token.lemma_.lower().strip() if token.lemma_ else word.lower()
                             morph_dict = {}
                             if token.morph:
-                                morph_dict = {str(k): str(v) for k, v in token.morph.to_dict().items()}
-                            word_to_spacy[word_lower] = {
+                                morph_dict = _morph_to_dict(token.morph)
+                            word_to_spacy[word.lower()] = {
                                 'pos': token.pos_,
                                 'tag': token.tag_,
                                 'morph': morph_dict,
-                                'lemma': lemma if lemma else word_lower,
-                                'original': word_original  # Store original capitalization
+                                'lemma': lemma if lemma else word.lower()
                             }
-                except Exception as e:
-                    print(f"Error batch processing words: {e}")
-                    # Fallback to individual processing for this batch
-                    for word in batch:
-                        try:
-                            doc = spacy_nlp(word.lower())
-                            if len(doc) > 0:
-                                token = doc[0]
-                                lemma = token.lemma_.lower().strip() if token.lemma_ else word.lower()
-                                morph_dict = {}
-                                if token.morph:
-                                    morph_dict = {str(k): str(v) for k, v in token.morph.to_dict().items()}
-                                word_to_spacy[word.lower()] = {
-                                    'pos': token.pos_,
-                                    'tag': token.tag_,
-                                    'morph': morph_dict,
-                                    'lemma': lemma if lemma else word.lower()
-                                }
-                        except:
-                            pass
+                    except:
+                        pass
         
         # Group words by lemma using batch-processed spaCy info
         # IMPORTANT: Normalize clitic forms (e.g., "conocerla" -> "conocere") before grouping
         lemma_groups = {}  # lemma -> list of (word, data, spacy_info)
         
-        # Import dictionary service for normalization (handles clitics properly)
-        from .dictionary_service import DictionaryService
-        dict_normalizer = DictionaryService()
+        # Dictionary service handles clitic normalization. Reuse the caller's instance
+        # so its loaded spaCy models and normalization cache carry over between books.
+        if dictionary_service is not None:
+            dict_normalizer = dictionary_service
+        else:
+            from .dictionary_service import DictionaryService
+            dict_normalizer = DictionaryService()
+        
+        # CRITICAL: Normalize clitic forms BEFORE getting spaCy lemma
+        # This ensures "conocerla" -> "conocere" before grouping.
+        # Done once per distinct lowercase form, ahead of the grouping loop, as one
+        # batched spaCy pass inside the dictionary service.
+        normalize_words = {
+            word_lower
+            for word_lower in (data.get('_lower') or word.lower().strip() for word, data in analysis['vocabulary'].items())
+            if len(word_lower) >= 2
+        }
+        normalized_forms = dict_normalizer.normalize_word_forms(list(normalize_words), language)
         
         for word, data in analysis['vocabulary'].items():
-            word_lower = word.lower().strip()
+            word_lower = data.get('_lower') or word.lower().strip()
             
             # Skip empty or single-character words
             if not word_lower or len(word_lower) < 2:
                 continue
             
-            # CRITICAL: Normalize clitic forms BEFORE getting spaCy lemma
-            # This ensures "conocerla" -> "conocere" before grouping
-            normalized_word = dict_normalizer.normalize_word_form(word_lower, language)
+            normalized_word = normalized_forms[word_lower]
             
             # Get spaCy info from batch processing (use normalized word for lookup if available)
             spacy_lookup_key = normalized_word if normalized_word in word_to_spacy else word_lower
@@ -1025,8 +1363,7 @@ class ComprehensiveVocabularyProcessor:
                 continue
             
             # Skip if lemma is a grammatical category name (not an actual word)
-            category_names = {'article', 'preposition', 'conjunction', 'pronoun', 'adverb', 'adjective', 'noun', 'verb'}
-            if lemma.lower() in category_names:
+            if lemma.lower() in _CATEGORY_NAMES:
                 # Use the normalized word itself instead of the category
                 lemma = normalized_word
                 
@@ -1037,21 +1374,34 @@ class ComprehensiveVocabularyProcessor:
         print(f"Grouped {len(analysis['vocabulary'])} words into {len(lemma_groups)} lemmas")
         
         # OPTIMIZED: Skip dictionary lookups for very common words (articles, prepositions, etc.)
-        common_words_skip_dict = {
-            'it': {'il', 'lo', 'la', 'i', 'gli', 'le', 'un', 'uno', 'una', 'di', 'a', 'da', 'in', 'con', 'su', 'per', 'e', 'che', 'è', 'sono'},
-            'en': {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'is', 'are', 'was', 'were'},
-            'es': {'el', 'la', 'los', 'las', 'un', 'una', 'de', 'a', 'en', 'con', 'por', 'para'},
-            'fr': {'le', 'la', 'les', 'un', 'une', 'de', 'à', 'dans', 'pour', 'avec'},
-            'de': {'der', 'die', 'das', 'ein', 'eine', 'in', 'auf', 'an', 'mit'}
-        }
-        skip_dict_lookup = common_words_skip_dict.get(language, set())
+        skip_dict_lookup = _SKIP_DICT_LOOKUP.get(language, frozenset())
         
         # Save lemmas with dictionary information
         saved_count = 0
         token_count = 0
         lemma_records = []  # Batch collect lemma records
         token_records = []  # Batch collect token records
-        token_to_lemma_map = {}  # Map original_token -> lemma for ID resolution
+        token_to_new_key = {}  # original_token -> key of its not-yet-inserted lemma
+        new_lemma_ids = {}  # lemma -> id for rows inserted during this run (from RETURNING)
+        pending_lemmas = {}  # lemma -> record queued in lemma_records but not yet written
+        
+        # Prefetch existing lemmas for every spelling a group may end up saved under
+        # (group key, or a form's lowercase/original spelling when the lemma is replaced
+        # by the canonical form) so the loop below never issues per-lemma SELECTs
+        candidate_keys = set(lemma_groups)
+        for word_list in lemma_groups.values():
+            for word_key, word_data, _ in word_list:
+                candidate_keys.add(word_data.get('_lower') or word_key.lower().strip())
+                candidate_keys.add(str(word_data.get('original', word_key)).strip())
+        existing_by_lemma = self._load_existing_lemmas(db, candidate_keys, language)
+        if dictionary_service:
+            # Warm the dictionary's DB lookup cache from the same prefetch, then resolve the
+            # normalized lookup forms (and misses) it will probe with one IN query per chunk
+            dictionary_service.prime_lemma_cache(existing_by_lemma.values())
+            dictionary_service.prefetch_db_lemmas(candidate_keys, language, db)
+        
+        # Infinitive endings for this language: (non-reflexive, reflexive)
+        infinitive_suffixes, reflexive_infinitive_suffixes = _INFINITIVE_SUFFIXES.get(language, ((), ()))
         
         for lemma, word_list in lemma_groups.items():
             try:
@@ -1060,25 +1410,18 @@ class ComprehensiveVocabularyProcessor:
                 # Sort by: 1) base form (infinitive/lemma) if it exists, 2) frequency
                 def sort_key(x):
                     word_key, word_data, _ = x
-                    word_lower = word_key.lower().strip()
+                    word_lower = word_data.get('_lower') or word_key.lower().strip()
                     freq = word_data.get('frequency', 0)
                     
                     # Prefer the lemma itself if it appears in the word list
                     if word_lower == lemma:
                         return (0, -freq)  # Base form first, then by frequency
                     
-                    # For verbs, prefer infinitive forms (ends with -are, -ere, -ire for Italian)
-                    if language in ['it', 'es', 'fr']:
-                        if language == 'it' and word_lower.endswith(('are', 'ere', 'ire', 'irsi', 'arsi', 'ersi')):
-                            # Prefer infinitives, especially non-reflexive ones
-                            if word_lower.endswith(('are', 'ere', 'ire')):
-                                return (1, -freq)  # Non-reflexive infinitives
-                            else:
-                                return (2, -freq)  # Reflexive infinitives
-                        elif language == 'es' and word_lower.endswith(('ar', 'er', 'ir')):
-                            return (1, -freq)
-                        elif language == 'fr' and word_lower.endswith(('er', 'ir', 're')):
-                            return (1, -freq)
+                    # For verbs, prefer infinitive forms, non-reflexive ones first
+                    if word_lower.endswith(infinitive_suffixes):
+                        return (1, -freq)  # Non-reflexive infinitives
+                    if word_lower.endswith(reflexive_infinitive_suffixes):
+                        return (2, -freq)  # Reflexive infinitives
                     
                     # Otherwise, sort by frequency (higher frequency first)
                     return (3, -freq)
@@ -1089,40 +1432,46 @@ class ComprehensiveVocabularyProcessor:
                 # Use the ORIGINAL capitalization from the data, not the lowercase key
                 # This preserves proper nouns like "Ginzburg" instead of "ginzburg"
                 canonical_word = canonical_data.get('original', canonical_word_key)
-                canonical_word_lower = canonical_word.lower().strip()
+                canonical_word_lower = canonical_data.get('_lower') or canonical_word.lower().strip()
                 canonical_frequency = canonical_data.get('frequency', 0)
                 
                 # Check if this is a proper noun - preserve capitalization (e.g., "Einaudi", "Ginzburg")
                 # Proper nouns are detected by: spaCy PROPN tag OR majority of word forms start with capital
-                # Check original forms, not lowercase keys
-                original_forms = [d.get('original', w) for w, d, _ in word_list]
-                capitalized_count = len([w for w in original_forms if w and w[0].isupper()])
-                total_count = len(original_forms)
+                # Check original forms, not lowercase keys.
+                # One pass collects total frequency, capitalization counts, lowercase forms and whether
+                # the lemma itself appears in the list (used further below).
+                capitalized_count = 0
+                total_frequency = 0  # Combined frequency of all word forms
+                all_word_forms = []
+                lemma_in_list = False
+                lemma_frequency = 0
+                for w, d, _ in word_list:
+                    total_frequency += d.get('frequency', 0)
+                    original_form = d.get('original', w)
+                    if original_form and original_form[0].isupper():
+                        capitalized_count += 1
+                    # 'original' is the first occurrence of the lowercase key, so '_lower' matches it
+                    form_lower = d.get('_lower') or original_form.lower().strip()
+                    all_word_forms.append(form_lower)
+                    if not lemma_in_list and form_lower == lemma:
+                        lemma_in_list = True
+                        lemma_frequency = d.get('frequency', 0)
+                total_count = len(word_list)
                 
                 # More robust proper noun detection:
                 # 1. spaCy PROPN tag (most reliable)
                 # 2. Canonical word starts with capital AND majority of forms are capitalized
                 # 3. If canonical word starts with capital and appears frequently, likely a proper noun
+                # (cheap spaCy tag check first; integer majority test avoids float math)
                 is_proper_noun = (
                     canonical_spacy.get('pos') == 'PROPN' or
                     (canonical_word and canonical_word[0].isupper() and 
-                     (capitalized_count > total_count * 0.5 or 
+                     (2 * capitalized_count > total_count or 
                       (capitalized_count > 0 and canonical_frequency > 5)))  # If it appears capitalized and frequently, likely proper noun
                 )
                 
-                # Check if the lemma actually appears in the word list
+                # Check if the lemma actually appears in the word list (computed above)
                 # If spaCy is correct, the lemma (e.g., "scusare") should be in the list
-                lemma_in_list = False
-                lemma_frequency = 0
-                all_word_forms = [d.get('original', w[0]).lower().strip() for w, d, _ in word_list]
-                
-                for w, d, _ in word_list:
-                    original_form = d.get('original', w)
-                    if original_form.lower().strip() == lemma:
-                        lemma_in_list = True
-                        lemma_frequency = d.get('frequency', 0)
-                        break
-                
                 # If lemma doesn't appear in the word list, it's likely broken/incomplete
                 # Check if any word form is longer and starts with the lemma (e.g., "scus" -> "scusare")
                 if not lemma_in_list:
@@ -1135,16 +1484,16 @@ class ComprehensiveVocabularyProcessor:
                         # Use the most frequent word form as the lemma
                         old_lemma = lemma
                         lemma = canonical_word_lower
-                        print(f"Fixed broken lemma: using most frequent form '{lemma}' (freq: {canonical_frequency}) instead of '{old_lemma}'")
+                        logger.debug("Fixed broken lemma: using most frequent form '%s' (freq: %s) instead of '%s'", lemma, canonical_frequency, old_lemma)
                 
                 # If lemma is in list but much less frequent than canonical, prefer canonical if it's the infinitive
                 # (This handles cases where "scusare" appears but "scusi" is more frequent)
                 elif lemma_in_list and canonical_frequency > lemma_frequency * 3:
                     # Check if canonical word looks like an infinitive (ends with -are, -ere, -ire for Italian)
-                    if language == 'it' and canonical_word_lower.endswith(('are', 'ere', 'ire')):
+                    if language == 'it' and canonical_word_lower.endswith(infinitive_suffixes):
                         # Prefer the infinitive form even if less frequent
                         lemma = canonical_word_lower
-                        print(f"Using infinitive form '{lemma}' as lemma (canonical freq: {canonical_frequency} vs lemma freq: {lemma_frequency})")
+                        logger.debug("Using infinitive form '%s' as lemma (canonical freq: %s vs lemma freq: %s)", lemma, canonical_frequency, lemma_frequency)
                 
                 # Use spaCy POS if available (most reliable)
                 spacy_pos = canonical_spacy.get('pos', 'X')
@@ -1160,20 +1509,11 @@ class ComprehensiveVocabularyProcessor:
                         # If word exists in DB with definition, no API call needed!
                         dict_info = dictionary_service.get_word_info(lemma, language, "en", db=db)
                     except Exception as e:
-                        print(f"Dictionary lookup failed for '{lemma}': {e}")
+                        logger.warning("Dictionary lookup failed for '%s': %s", lemma, e)
                         dict_info = {}
                 # Note: Dictionary lookups are now smart - they check DB first
                 # Only new words trigger API calls, making it much faster
-                #     # Check if we should skip this word (common function words)
-                #     common_words_skip_dict = {
-                #         'it': {'il', 'lo', 'la', 'i', 'gli', 'le', 'un', 'uno', 'una', 'di', 'a', 'da', 'in', 'con', 'su', 'per', 'e', 'che', 'è', 'sono'},
-                #         'en': {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'is', 'are', 'was', 'were'},
-                #         'es': {'el', 'la', 'los', 'las', 'un', 'una', 'de', 'a', 'en', 'con', 'por', 'para'},
-                #         'fr': {'le', 'la', 'les', 'un', 'une', 'de', 'à', 'dans', 'pour', 'avec'},
-                #         'de': {'der', 'die', 'das', 'ein', 'eine', 'in', 'auf', 'an', 'mit'}
-                #     }
-                #     skip_dict_lookup = common_words_skip_dict.get(language, set())
-                #     
+                #     # Check if we should skip this word (common function words, see _SKIP_DICT_LOOKUP)
                 #     if lemma not in skip_dict_lookup:
                 #         try:
                 #             # Only lookup dictionary for meaningful words (not articles/prepositions)
@@ -1182,9 +1522,6 @@ class ComprehensiveVocabularyProcessor:
                 #             print(f"Dictionary lookup failed for '{lemma}': {e}")
                 #             dict_info = {}
                 
-                # Combine all frequencies from all word forms
-                total_frequency = sum(d[1].get('frequency', 0) for d in word_list)
-                
                 # Build definition prioritizing English translation ONLY
                 definition_parts = []
                 # First priority: dictionary translation (English)
@@ -1258,24 +1595,27 @@ class ComprehensiveVocabularyProcessor:
                     # Also update lemma variable for consistency in lookups
                     lemma = lemma_to_save.lower()  # Keep lowercase for grouping/comparison
                 
-                # Check if lemma already exists (batch query optimization)
+                # Check if lemma already exists (prefetched above)
                 # Check both lowercase and capitalized forms for proper nouns
-                existing = db.query(Lemma).filter(
-                    Lemma.lemma == lemma_to_save,
-                    Lemma.language == language
-                ).first()
+                existing = existing_by_lemma.get(lemma_to_save)
                 
                 # Also check lowercase version if we're saving capitalized
                 if not existing and lemma_to_save != lemma:
-                    existing = db.query(Lemma).filter(
-                        Lemma.lemma == lemma,
-                        Lemma.language == language
-                    ).first()
+                    existing = existing_by_lemma.get(lemma)
+                
+                # Inserted earlier in this run: only now load the row so it can be updated
+                if not existing:
+                    new_id = new_lemma_ids.get(lemma_to_save) or new_lemma_ids.get(lemma)
+                    if new_id:
+                        existing = db.get(Lemma, new_id)
+                        existing_by_lemma[existing.lemma] = existing
                 
                 if existing:
+                    previous_key = existing.lemma
                     # Update existing lemma - preserve capitalization if it's a proper noun
                     if is_proper_noun and canonical_word and canonical_word[0].isupper():
                         existing.lemma = lemma_to_save  # Update to capitalized form
+                        existing_by_lemma[lemma_to_save] = existing
                     if pos:
                         existing.pos = pos
                     if definition:
@@ -1284,28 +1624,47 @@ class ComprehensiveVocabularyProcessor:
                         existing.morphology = morphology
                     existing.global_frequency = max(existing.global_frequency or 0, total_frequency)
                     lemma_id = existing.id
+                    if dictionary_service:
+                        # Updated through the ORM: drop the dictionary's cached snapshot (both spellings)
+                        dictionary_service.invalidate_lemma_cache({previous_key, existing.lemma}, language)
                 else:
-                    # Create new lemma (collect for batch insert)
-                    lemma_records.append({
-                        'lemma': lemma_to_save,  # Use capitalized form for proper nouns
-                        'language': language,
-                        'pos': pos,
-                        'definition': definition,
-                        'morphology': morphology,
-                        'global_frequency': total_frequency,
-                        'difficulty_level': 0.0
-                    })
+                    pending = pending_lemmas.get(lemma_to_save)
+                    if pending:
+                        # Another group already queued this lemma in the current batch: merge
+                        # into that record, (lemma, language) is unique
+                        if pos:
+                            pending['pos'] = pos
+                        if definition:
+                            pending['definition'] = definition
+                        if morphology:
+                            pending['morphology'] = morphology
+                        pending['global_frequency'] = max(pending['global_frequency'], total_frequency)
+                    else:
+                        # Create new lemma (collect for batch insert)
+                        record = {
+                            'lemma': lemma_to_save,  # Use capitalized form for proper nouns
+                            'language': language,
+                            'pos': pos,
+                            'definition': definition,
+                            'morphology': morphology,
+                            'global_frequency': total_frequency,
+                            'difficulty_level': 0.0
+                        }
+                        lemma_records.append(record)
+                        pending_lemmas[lemma_to_save] = record
                     lemma_id = None  # Will be set after flush
                 
-                # Store mapping for token ID resolution
-                # word_list contains tuples of (word_form, word_data, spacy_info)
-                for word_form, word_data, _ in word_list:
-                    token_to_lemma_map[str(word_form)] = lemma_id if existing else lemma
+                # Tokens are stored under the canonical original spelling, which may
+                # differ in case from its vocabulary key
+                canonical_str = str(canonical_word)
+                if not existing:
+                    # Tokens of a new lemma get its ID after the insert: remember the exact
+                    # string it is inserted under (capitalized for proper nouns)
+                    token_to_new_key[canonical_str] = lemma_to_save
                 
                 # OPTIMIZED: Collect tokens for batch insert (limit tokens per word)
                 # Only create tokens for the most frequent word form to reduce DB writes
                 # NOTE: we already selected the canonical form above as (canonical_word, canonical_data, canonical_spacy)
-                canonical_word_form = canonical_word
                 canonical_word_data = canonical_data
                 positions = canonical_word_data.get('positions', [])
                 frequency = int(canonical_word_data.get('frequency', 1) or 1)
@@ -1313,109 +1672,60 @@ class ComprehensiveVocabularyProcessor:
                 # Store one token per occurrence so in-book frequency counts remain accurate
                 max_tokens_per_lemma = max(frequency, 1)
                 
-                if positions and len(positions) > 0:
-                    # Use actual positions to keep a precise token count for the book
-                    sampled_positions = positions[:max_tokens_per_lemma]
-                    for pos_idx in sampled_positions:
-                        token_records.append({
-                            'book_id': book_id,
-                            'lemma_id': lemma_id,  # None if new, will be resolved after flush
-                            'position': pos_idx,
-                            'original_token': str(canonical_word_form),
-                            'sentence_context': ''  # Skip context extraction for speed
-                        })
-                else:
-                    # Positions missing—still record frequency accurately
-                    for i in range(max_tokens_per_lemma):
-                        token_records.append({
-                            'book_id': book_id,
-                            'lemma_id': lemma_id,
-                            'position': i,
-                            'original_token': str(canonical_word_form),
-                            'sentence_context': ''
-                        })
+                # Optionally skip rare words' tokens (MIN_TOKEN_FREQUENCY); off by default because
+                # a book's vocabulary and counts are read back through its tokens
+                if frequency >= self.min_token_frequency:
+                    # Fields shared by every token of this lemma; each row only adds its position
+                    token_template = {
+                        'book_id': book_id,
+                        'lemma_id': lemma_id,  # None if new, will be resolved after flush
+                        'original_token': canonical_str,
+                        # sentence_context omitted (stored as NULL): context extraction is skipped for speed
+                    }
+                    if positions and len(positions) > 0:
+                        # Use actual positions to keep a precise token count for the book
+                        sampled_positions = islice(positions, max_tokens_per_lemma)
+                    else:
+                        # Positions missing—still record frequency accurately
+                        sampled_positions = range(max_tokens_per_lemma)
+                    token_records.extend({**token_template, 'position': pos_idx} for pos_idx in sampled_positions)
                 
                 saved_count += 1
                 
-                # OPTIMIZED: Batch commit every 100 lemmas for incremental vocabulary availability
-                # Reduced commit frequency for better performance with large books (30k+ words)
-                # This allows vocabulary to appear while processing, not all at once at the end
-                if saved_count % 100 == 0:
-                    # First flush any pending lemmas to get IDs
-                    if lemma_records:
-                        for lr in lemma_records:
-                            lemma_record = Lemma(**lr)
-                            db.add(lemma_record)
-                        db.flush()
-                        # Update lemma_id in token records using the mapping
-                        for tr in token_records:
-                            if tr['lemma_id'] is None:
-                                lemma_text = token_to_lemma_map.get(tr['original_token'])
-                                if lemma_text:
-                                    found_lemma = db.query(Lemma).filter(
-                                        Lemma.lemma == lemma_text,
-                                        Lemma.language == language
-                                    ).first()
-                                    if found_lemma:
-                                        tr['lemma_id'] = found_lemma.id
-                        lemma_records = []
-                    
-                    # Batch insert tokens
-                    if token_records:
-                        # Filter out tokens without lemma_id
-                        valid_tokens = [tr for tr in token_records if tr['lemma_id'] is not None]
-                        for tr in valid_tokens:
-                            token = Token(**tr)
-                            db.add(token)
-                        token_count += len(valid_tokens)
-                        token_records = []
-                    
-                    db.commit()
+                # OPTIMIZED: Write pending rows in batches; committing is decoupled and
+                # happens far less often (see _COMMIT_BATCH) since each commit syncs to disk
+                if saved_count % _WRITE_BATCH == 0 or len(token_records) >= _MAX_PENDING_TOKENS:
+                    token_count += self._write_pending_records(
+                        db, lemma_records, token_records, token_to_new_key, new_lemma_ids, language, dictionary_service
+                    )
+                    pending_lemmas.clear()
                     progress_pct = int((saved_count / max(len(lemma_groups), 1)) * 100)
-                    print(f"  ✅ Committed batch: {saved_count}/{len(lemma_groups)} lemmas ({progress_pct}%), {token_count} tokens")
-                    
-                    # Update book progress in database for real-time tracking
+                    logger.info("Wrote batch: %s/%s lemmas (%s%%), %s tokens", saved_count, len(lemma_groups), progress_pct, token_count)
+                
+                # Periodic commit so vocabulary appears while processing, not all at once at the end
+                if saved_count % _COMMIT_BATCH == 0:
+                    # Update book progress in the same transaction for real-time tracking:
+                    # one UPDATE statement, no SELECT of the book row
                     try:
-                        book_update = db.query(Book).filter(Book.id == book_id).first()
-                        if book_update:
-                            # Update unique_lemmas count as we process
-                            book_update.unique_lemmas = saved_count
-                            db.commit()
-                            print(f"  📊 Progress updated: {saved_count} lemmas processed")
+                        db.execute(
+                            update(Book).where(Book.id == book_id).values(unique_lemmas=saved_count),
+                            execution_options={"synchronize_session": False},
+                        )
                     except Exception as e:
-                        print(f"  Warning: Could not update book progress: {e}")
+                        logger.warning("Could not update book progress: %s", e)
+                    db.commit()
+                    logger.info("Committed: %s lemmas processed", saved_count)
                     
             except Exception as e:
-                print(f"Error processing lemma '{lemma}': {e}")
-                import traceback
-                traceback.print_exc()
+                logger.exception("Error processing lemma '%s': %s", lemma, e)
                 continue
         
         # Final flush of remaining records
-        if lemma_records:
-            for lr in lemma_records:
-                lemma_record = Lemma(**lr)
-                db.add(lemma_record)
-            db.flush()
-        
-        if token_records:
-            # Update lemma IDs for remaining tokens using the mapping
-            for tr in token_records:
-                if tr['lemma_id'] is None:
-                    lemma_text = token_to_lemma_map.get(tr['original_token'])
-                    if lemma_text:
-                        found_lemma = db.query(Lemma).filter(
-                            Lemma.lemma == lemma_text,
-                            Lemma.language == language
-                        ).first()
-                        if found_lemma:
-                            tr['lemma_id'] = found_lemma.id
-            
-            valid_tokens = [tr for tr in token_records if tr['lemma_id'] is not None]
-            for tr in valid_tokens:
-                token = Token(**tr)
-                db.add(token)
-            token_count += len(valid_tokens)
+        token_count += self._write_pending_records(
+            db, lemma_records, token_records, token_to_new_key, new_lemma_ids, language, dictionary_service
+        )
         
         db.commit()
+        if dictionary_service:
+            dictionary_service.clear_db_lemma_misses()
         print(f"✅ Saved {saved_count} lemmas and {token_count} tokens with optimized batch processing")
\ No newline at end of file
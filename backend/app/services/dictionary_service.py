@@ -6,12 +6,23 @@ Fallback: MyMemory, WordReference, LibreTranslate, etc.
 """
 import os
 import requests
-from typing import Dict, List, Optional
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
 import json
+import logging
+import threading
 import time
 import re
 import unicodedata
+from functools import lru_cache
+from itertools import islice
 from wordfreq import zipf_frequency
+from ..utils import fast_json
+from ..utils.lru_dict import LRUDict
+from ..utils.sqlite_cache import SqliteCache
 
 # Try to import KaikkiService, but don't fail if it's not available
 try:
@@ -29,6 +40,219 @@ except ImportError:
     WIKTEXTRACT_SERVICE_AVAILABLE = False
     WiktextractService = None
 
+logger = logging.getLogger(__name__)
+
+# Italian clitic pronouns that can be attached to infinitives ("conoscerla", "dirglielo")
+_ITALIAN_CLITICS = frozenset({
+    'gliene', 'gliela', 'glielo', 'glieli', 'gliele',
+    'mene', 'tene', 'cene', 'vene',
+    'mele', 'mela', 'melo', 'meli',
+    'tele', 'tela', 'telo', 'teli',
+    'cele', 'cela', 'celo', 'celi',
+    'gli', 'la', 'le', 'li', 'lo',
+    'mi', 'ti', 'si', 'ci', 'vi', 'ne'
+})
+_ITALIAN_CLITIC_LENGTHS = tuple(sorted({len(s) for s in _ITALIAN_CLITICS}, reverse=True))
+# Same set as a tuple for a single str.endswith() early reject
+_ITALIAN_CLITIC_SUFFIXES = tuple(sorted(_ITALIAN_CLITICS, key=len, reverse=True))
+
+# Patterns/tables used on every lookup, compiled once
+_WHITESPACE_RE = re.compile(r'\s+')
+_TRAILING_SENSE_NUMBER_RE = re.compile(r'-\d+$')
+_TRAILING_PAREN_NUMBER_RE = re.compile(r'\s*\(\d+\)$')
+# First text run of a WordReference "ToWrd" cell; tolerates either quote style, extra
+# attributes and trailing inline markup (<em>, <span>) inside the cell
+_WORDREFERENCE_TRANSLATION_RE = re.compile(r'<td\b[^>]*\bclass=["\']ToWrd["\'][^>]*>\s*([^<]+)')
+_QUOTE_STRIP = str.maketrans('', '', "'’")
+
+_SPACY_MODEL_NAMES = {
+    'en': 'en_core_web_sm',
+    'it': 'it_core_news_sm',
+    'es': 'es_core_news_sm',
+    'fr': 'fr_core_news_sm',
+    'de': 'de_core_news_sm',
+    'pt': 'pt_core_news_sm'
+}
+
+# Grammar 'type' (from _analyze_romance_grammar) -> part of speech
+_GRAMMAR_TYPE_TO_POS = {
+    'verb': 'VERB',
+    'noun/adjective': 'NOUN',
+    'article': 'DET',
+    'preposition': 'ADP'
+}
+
+# Heuristic grammar used by _analyze_romance_grammar when spaCy is unavailable
+def _article(definite: bool, gender: str, number: str) -> Dict:
+    return {'type': 'article', 'definite': definite, 'gender': gender, 'number': number}
+
+_IT_ARTICLES = {
+    'il': _article(True, 'masculine', 'singular'),
+    'lo': _article(True, 'masculine', 'singular'),
+    'la': _article(True, 'feminine', 'singular'),
+    'i': _article(True, 'masculine', 'plural'),
+    'gli': _article(True, 'masculine', 'plural'),
+    'le': _article(True, 'feminine', 'plural'),
+    'un': _article(False, 'masculine', 'singular'),
+    'uno': _article(False, 'masculine', 'singular'),
+    'una': _article(False, 'feminine', 'singular'),
+    "un'": _article(False, 'feminine', 'singular'),
+}
+_IT_PREPOSITIONS = frozenset({'di', 'a', 'da', 'in', 'con', 'su', 'per', 'tra', 'fra'})
+_IT_CONJUNCTIONS = frozenset({'e', 'o', 'ma', 'perché', 'che', 'quando', 'dove'})
+
+def _infinitive(conjugation: str) -> Dict:
+    return {'type': 'verb', 'conjugation': conjugation, 'form': 'infinitive'}
+
+def _noun_adjective(gender: str, number: str) -> Dict:
+    return {'type': 'noun/adjective', 'gender': gender, 'number': number}
+
+# language -> word ending -> grammar; endings of one length never overlap, and
+# lookups go longest first (matching the order of the old elif chains)
+_SUFFIX_GRAMMAR = {
+    'it': {
+        'are': _infinitive('1st (-are)'),
+        'ere': _infinitive('2nd (-ere)'),
+        'ire': _infinitive('3rd (-ire)'),
+        'o': _noun_adjective('masculine', 'singular'),
+        'a': _noun_adjective('feminine', 'singular'),
+        'i': _noun_adjective('masculine', 'plural'),
+        'e': _noun_adjective('feminine', 'plural'),
+    },
+    'es': {
+        'ar': _infinitive('1st (-ar)'),
+        'er': _infinitive('2nd (-er)'),
+        'ir': _infinitive('3rd (-ir)'),
+        'o': _noun_adjective('masculine', 'singular'),
+        'a': _noun_adjective('feminine', 'singular'),
+    },
+    'fr': {
+        'er': _infinitive('1st (-er)'),
+        'ir': _infinitive('2nd (-ir)'),
+        're': _infinitive('3rd (-re)'),
+    },
+}
+
+# Closed-class words with a stable gloss, answered locally before any provider call:
+# (source, target) -> word -> translation
+_COMMON_TRANSLATIONS = {
+    ('it', 'en'): {
+        'il': 'the', 'lo': 'the', 'la': 'the', 'i': 'the', 'gli': 'the', 'le': 'the',
+        'di': 'of', 'a': 'to', 'da': 'from', 'con': 'with', 'su': 'on',
+        'per': 'for', 'tra': 'between', 'fra': 'between',
+        'e': 'and', 'o': 'or', 'ma': 'but', 'che': 'that', 'se': 'if',
+        'perché': 'because', 'quando': 'when', 'dove': 'where', 'come': 'how',
+        'non': 'not', 'anche': 'also', 'molto': 'very', 'più': 'more', 'già': 'already',
+        'è': 'is', 'sono': 'are', 'essere': 'to be', 'avere': 'to have',
+    },
+}
+
+# In-memory cache bounds (entries); the SQLite layer keeps everything else
+_WORD_INFO_CACHE_SIZE = 50000
+_NORMALIZATION_CACHE_SIZE = 200000
+_DB_LEMMA_CACHE_SIZE = 50000
+_TOKEN_INFO_CACHE_SIZE = 100000
+_NOT_CACHED = object()  # cache-miss sentinel where None is a cached value
+# Languages routed to _get_romance_language_info (grammar + POS analysis)
+_ROMANCE_LANGUAGES = frozenset({'it', 'es', 'fr', 'de', 'pt'})
+# Concurrent get_word_info calls in batch_get_word_info
+_BATCH_LOOKUP_WORKERS = 8
+
+_MYMEMORY_URL = "https://api.mymemory.translated.net/get"
+# Seconds to wait on a provider before also asking the next one (see _first_available)
+_PROVIDER_HEDGE_DELAY = 1.5
+_HTTP_RETRY = Retry(total=2, connect=1, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504))
+# Requests/second per provider host (public-tier quotas); other hosts use 1/rate_limit_delay
+_PROVIDER_RATES = {
+    'api.mymemory.translated.net': 5.0,
+    'api.dictionaryapi.dev': 10.0,
+    'libretranslate.com': 2.0,
+    'translate.argosopentech.com': 2.0,
+}
+# Primary public LibreTranslate instances, in order of preference
+_LIBRETRANSLATE_ENDPOINTS = (
+    'https://libretranslate.com/translate',
+    'https://translate.argosopentech.com/translate',
+)
+
+@lru_cache(maxsize=8)
+def _load_nlp(model_name: str, exclude: Tuple[str, ...]):
+    """
+    Load a spaCy pipeline once per process. DictionaryService is instantiated by several
+    routers and per processing run; they all share these models instead of each
+    deserializing its own copy. Load errors propagate uncached so a later download can retry.
+    
+    Excluded components are never deserialized (unlike disable=, which still loads
+    their weights), so they cost neither load time nor memory.
+    """
+    import spacy
+    return spacy.load(model_name, exclude=list(exclude))
+
+# language -> Future of its spaCy pipeline, filled once per process by _preload_spacy_models
+_preloaded_models = {}
+_preload_lock = threading.Lock()
+_preload_started = False
+
+def _preload_spacy_models(exclude: Tuple[str, ...]) -> None:
+    """
+    Start loading the LEXEME_PRELOAD_LANGS (e.g. "it,en,es") spaCy models in the background
+    so the first request doesn't pay the deserialization cost.
+    
+    Runs once per process on one shared executor, however many DictionaryService
+    instances the routers and processing runs create.
+    """
+    global _preload_started
+    with _preload_lock:
+        if _preload_started:
+            return
+        _preload_started = True
+        preload_langs = [
+            lang.strip().lower()
+            for lang in os.getenv("LEXEME_PRELOAD_LANGS", "").split(",")
+            if lang.strip()
+        ]
+        if not preload_langs:
+            return
+        preloader = ThreadPoolExecutor(max_workers=len(preload_langs), thread_name_prefix="spacy-preload")
+        by_model = {}
+        for lang in preload_langs:
+            model_name = _SPACY_MODEL_NAMES.get(lang, 'en_core_web_sm')
+            if model_name not in by_model:
+                by_model[model_name] = preloader.submit(_load_nlp, model_name, exclude)
+            _preloaded_models[lang] = by_model[model_name]
+        preloader.shutdown(wait=False)
+
+class _HostRateLimiter:
+    """
+    Per-host token bucket: each host allows short bursts of up to `burst` requests
+    and refills at one request per `delay` seconds.
+    
+    Callers only sleep once a host's bucket is drained, and requests to different
+    providers never wait on each other, so they can run concurrently.
+    """
+    
+    def __init__(self, delay: float, burst: int = 5, host_rates: Optional[Dict[str, float]] = None):
+        self.rate = 1.0 / delay if delay > 0 else float('inf')
+        self.burst = burst
+        self.host_rates = host_rates or {}  # host -> requests/second, overriding 1/delay
+        self._buckets = {}  # host -> (tokens, last refill time)
+        self._lock = threading.Lock()
+    
+    def wait(self, url: str) -> None:
+        host = urlsplit(url).netloc
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                tokens, last = self._buckets.get(host, (float(self.burst), now))
+                rate = self.host_rates.get(host, self.rate)
+                tokens = min(float(self.burst), tokens + (now - last) * rate)
+                if tokens >= 1.0:
+                    self._buckets[host] = (tokens - 1.0, now)
+                    return
+                self._buckets[host] = (tokens, now)
+                wait_for = (1.0 - tokens) / rate
+            time.sleep(wait_for)
+
 class DictionaryService:
     """
     Service for fetching word definitions, translations, and grammar information.
@@ -46,12 +270,44 @@ class DictionaryService:
         Args:
             db_session: Optional database session for checking existing lemmas
         """
-        self.cache = {}
+        # Bounded so long-running workers don't grow without limit across corpora
+        self.cache = LRUDict(maxsize=_WORD_INFO_CACHE_SIZE)
+        # Persistent layer behind self.cache / self.normalization_cache so lookups
+        # survive restarts; expired rows are swept once at startup
+        cache_path = os.getenv("DICTIONARY_CACHE_PATH", "dictionary_cache.sqlite")
+        cache_ttl = int(os.getenv("DICTIONARY_CACHE_TTL_DAYS", "30")) * 86400
+        self._persistent_cache = SqliteCache(cache_path, table="word_info", ttl_seconds=cache_ttl)
+        self._persistent_normalization_cache = SqliteCache(cache_path, table="normalization", ttl_seconds=cache_ttl)
+        self._persistent_cache.purge_expired()
+        self._persistent_normalization_cache.purge_expired()
         self.rate_limit_delay = 0.05  # Reduced delay for faster processing (was 0.1)
-        self.normalization_cache = {}
+        self._rate_limiter = _HostRateLimiter(self.rate_limit_delay, host_rates=_PROVIDER_RATES)
+        # One pooled HTTP session (keep-alive/TLS reuse) shared by all providers, and a
+        # small pool to query independent providers concurrently
+        self._http = requests.Session()
+        # Sized for batch_get_word_info workers x concurrent providers; transient 429/5xx
+        # answers are retried with backoff (honouring Retry-After) instead of failing the lookup
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=50, max_retries=_HTTP_RETRY)
+        self._http.mount("https://", adapter)
+        self._http.mount("http://", adapter)
+        self._http_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="dictionary-http")
+        self.normalization_cache = LRUDict(maxsize=_NORMALIZATION_CACHE_SIZE)
+        # (lemma, language) -> (definition, pos, morphology), or None when not in the DB
+        self._db_lemma_cache = LRUDict(maxsize=_DB_LEMMA_CACHE_SIZE)
+        # (lemma, language) keys the latest prefetch found absent; scoped to that run
+        # (replaced by the next prefetch, cleared by clear_db_lemma_misses) so they never go stale
+        self._db_lemma_misses = set()
         self._spacy_models = {}
+        # LEXEME_FAST_LEMMA=1: normalize with lookup-table lemmatizers (see _get_lemma_model)
+        self.fast_lemma_enabled = os.getenv("LEXEME_FAST_LEMMA", "").lower() in {"1", "true", "yes"}
+        self._lemma_models = {}
+        # (language, text) -> (lemma, pos, morph) from spaCy
+        self._token_info_cache = LRUDict(maxsize=_TOKEN_INFO_CACHE_SIZE)
+        # Only lemma/POS/morph are read; don't load the components that don't feed them
+        self._spacy_excluded_components = ("parser", "senter", "ner", "textcat")
         self._spacy_download_attempted = set()
         self.spacy_auto_download_enabled = self._should_auto_download_spacy()
+        _preload_spacy_models(self._spacy_excluded_components)
         self._db_session = db_session  # For database lookups
         
         # Initialize WiktextractService (direct Wiktionary parsing) - BEST QUALITY
@@ -67,6 +323,94 @@ class DictionaryService:
         else:
             self.kaikki_service = None
 
+    def normalize_word_forms(self, words: List[str], language: str) -> Dict[str, str]:
+        """
+        Batch version of normalize_word_form. Words missing from the normalization
+        cache go through spaCy in a single nlp.pipe() pass instead of one nlp() call each.
+        
+        Returns a dict mapping each input word to its normalized form.
+        """
+        language = (language or "en").lower()
+        results = {}
+        pending = {}  # lowercase word -> input spellings waiting for it
+        for word in words:
+            if not word:
+                continue
+            word_lower = word.strip().lower()
+            cache_key = (language, word_lower)
+            cached = self.normalization_cache.get(cache_key)
+            if cached is None:
+                cached = self._persistent_normalization_cache.get(f"{language}:{word_lower}")
+                if cached is not None:
+                    self.normalization_cache[cache_key] = cached
+            if cached is not None:
+                results[word] = cached or word_lower
+            else:
+                pending.setdefault(word_lower, []).append(word)
+        
+        if pending:
+            candidates = [self._strip_accents(word_lower) or word_lower for word_lower in pending]
+            lemmas = None
+            lemma_nlp = self._get_lemma_model(language)
+            nlp = lemma_nlp or self._get_spacy_model(language)
+            if nlp:
+                try:
+                    lemmas = []
+                    for candidate, doc in zip(candidates, nlp.pipe(candidates, batch_size=256)):
+                        if lemma_nlp:
+                            lemmas.append(doc[0].lemma_ if len(doc) > 0 else None)
+                            continue
+                        info = self._doc_token_info(doc)
+                        self._token_info_cache[(language, candidate)] = info
+                        lemmas.append(info[0] if info else None)
+                except Exception:
+                    lemmas = None
+            for i, (word_lower, originals) in enumerate(pending.items()):
+                lemma = lemmas[i] if lemmas else None
+                normalized = self._finish_normalization(word_lower, language, candidates[i], lemma)
+                for original in originals:
+                    results[original] = normalized or word_lower
+        return results
+    
+    def prime_lemma_cache(self, lemmas) -> None:
+        """Seed the database lookup cache from Lemma rows the caller already loaded."""
+        for row in lemmas:
+            self._db_lemma_cache[(row.lemma, row.language)] = (row.definition, row.pos, row.morphology)
+    
+    def invalidate_lemma_cache(self, lemmas, language: str) -> None:
+        """Drop cached database lookups for lemmas that were just inserted or changed."""
+        misses = self._db_lemma_misses
+        for lemma in lemmas:
+            self._db_lemma_cache.pop((lemma, language), None)
+            misses.discard((lemma, language))
+    
+    def clear_db_lemma_misses(self) -> None:
+        """End the current prefetch scope: forget which lemmas it found missing."""
+        self._db_lemma_misses = set()
+    
+    def _lookup_db_lemma(self, db, word: str, language: str, cache_only: bool = False):
+        """
+        Return (definition, pos, morphology) for a stored lemma, memoized per (word, language).
+        With cache_only the lookup never touches db (used by batch workers after a prefetch).
+        """
+        key = (word, language)
+        entry = self._db_lemma_cache.get(key)
+        if entry is not None:
+            return entry
+        if cache_only or key in self._db_lemma_misses:
+            return None
+        from ..models.lemma import Lemma
+        row = db.query(Lemma).filter(
+            Lemma.lemma == word,
+            Lemma.language == language
+        ).first()
+        if row is None:
+            # Not cached: the word may be stored later, and a negative would never expire
+            return None
+        entry = (row.definition, row.pos, row.morphology)
+        self._db_lemma_cache[key] = entry
+        return entry
+    
     def normalize_word_form(self, word: str, language: str) -> str:
         """
         Public helper that returns a normalized (typically infinitive) form for the word.
@@ -78,7 +422,8 @@ class DictionaryService:
         normalized = self._normalize_word_form(word.strip().lower(), language)
         return normalized or word.strip().lower()
     
-    def get_word_info(self, word: str, language: str, target_language: str = "en", db = None) -> Dict:
+    def get_word_info(self, word: str, language: str, target_language: str = "en", db = None,
+                      db_cache_only: bool = False) -> Dict:
         """
         Get comprehensive word information including translation and grammar breakdown.
         
@@ -86,6 +431,9 @@ class DictionaryService:
             word: The word to look up
             language: Source language code (e.g., 'it', 'en', 'es')
             target_language: Target language for translation (default: 'en')
+            db: Optional database session for the lemma-table lookup
+            db_cache_only: Answer the lemma-table lookup from the prefetched DB cache only,
+                never querying a session (safe from worker threads)
         
         Returns:
             Dictionary with definition, translation, grammar info, etc.
@@ -94,17 +442,34 @@ class DictionaryService:
         language = (language or "en").lower()
         target_language = (target_language or "en").lower()
         word_lower = word_clean.lower()
+        if language == target_language and language != 'en':
+            # Same-language lookup is an identity mapping: skip normalization, DB and APIs.
+            # (en->en keeps the dictionary-definition path below, which adds real content.)
+            return {
+                'word': word_clean,
+                'normalized_word': word_lower,
+                'normalization_applied': False,
+                'definition': word_clean,
+                'translation': word_clean,
+                'part_of_speech': '',
+                'grammar': {},
+                'examples': [],
+                'source': 'identity'
+            }
         normalized_word = self._normalize_word_form(word_lower, language)
         lookup_word = normalized_word or word_lower
-        cache_key = f"{lookup_word}_{language}_{target_language}"
-        
-        # Check in-memory cache first
-        if cache_key in self.cache:
-            cached = dict(self.cache[cache_key])
-            cached['word'] = word_clean or lookup_word
-            cached['normalized_word'] = lookup_word
-            cached['normalization_applied'] = lookup_word != word_lower
-            return cached
+        cache_key = (lookup_word, language, target_language)
+        
+        # Check in-memory cache first (the persistent cache is consulted after the DB below)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            # Stored entries are never mutated; overlay the per-call fields in one merge
+            return {
+                **cached,
+                'word': word_clean or lookup_word,
+                'normalized_word': lookup_word,
+                'normalization_applied': lookup_word != word_lower,
+            }
         
         result = {
             'word': word_clean or lookup_word,
@@ -121,22 +486,19 @@ class DictionaryService:
         # PRIMARY SOURCE: Check database first (grows organically as books are processed)
         # This is the REAL optimization - reuse definitions from previously processed books!
         db_to_use = db or self._db_session
-        if db_to_use:
+        if db_to_use or db_cache_only:
             try:
-                from ..models.lemma import Lemma
-                existing_lemma = db_to_use.query(Lemma).filter(
-                    Lemma.lemma == lookup_word,
-                    Lemma.language == language
-                ).first()
+                existing_lemma = self._lookup_db_lemma(db_to_use, lookup_word, language, cache_only=db_cache_only)
                 
-                if existing_lemma and existing_lemma.definition:
+                if existing_lemma and existing_lemma[0]:
                     # Found in database! Use it - no API call needed
-                    sanitized = self._sanitize_translation(existing_lemma.definition, lookup_word, language, allow_blank=True)
-                    result['definition'] = sanitized or existing_lemma.definition
-                    result['translation'] = sanitized or existing_lemma.definition  # Use sanitized translation when possible
-                    result['part_of_speech'] = existing_lemma.pos or ''
-                    if existing_lemma.morphology:
-                        result['grammar'] = existing_lemma.morphology
+                    definition, pos, morphology = existing_lemma
+                    sanitized = self._sanitize_translation(definition, lookup_word, language, allow_blank=True)
+                    result['definition'] = sanitized or definition
+                    result['translation'] = sanitized or definition  # Use sanitized translation when possible
+                    result['part_of_speech'] = pos or ''
+                    if morphology:
+                        result['grammar'] = morphology
                     result['source'] = 'database'
                     # Heuristic: sometimes older cached MT results are clearly wrong
                     # ("tuttora" -> "employees", "facevamo" -> "we would use").
@@ -144,11 +506,23 @@ class DictionaryService:
                     # to improve correctness. Avoid doing this for normal single-word
                     # translations to keep bulk processing fast.
                     if not self._should_refresh_cached_definition(result['translation'], lookup_word, language):
-                        self.cache[cache_key] = dict(result)
+                        self._remember_word_info(cache_key, result)
                         return result
             except Exception as e:
                 # If database lookup fails, continue to API fallbacks
-                print(f"[DictionaryService] Database lookup error: {e}")
+                logger.warning("[DictionaryService] Database lookup error: %s", e)
+
+        # Then successful lookups persisted by earlier runs; after the DB so that a
+        # definition saved to the lemmas table later is never hidden by a stale entry
+        persisted = self._persistent_cache.get("_".join(cache_key))
+        if persisted is not None:
+            self.cache[cache_key] = persisted
+            return {
+                **persisted,
+                'word': result['word'],
+                'normalized_word': lookup_word,
+                'normalization_applied': result['normalization_applied'],
+            }
 
         # SECONDARY SOURCE: Try direct Wiktionary parsing with wiktextract (BEST QUALITY)
         if self.wiktextract_service:
@@ -163,7 +537,7 @@ class DictionaryService:
                 result['definition'] = self._sanitize_translation(result.get('definition', ''), lookup_word, language, allow_blank=True)
                 # If we got good data, use it and skip fallbacks
                 if result.get('translation') or result.get('definition'):
-                    self.cache[cache_key] = dict(result)
+                    self._remember_word_info(cache_key, result)
                     return result
         
         # TERTIARY SOURCE: Try Wiktextract via kaikki.org (if local data available)
@@ -179,13 +553,13 @@ class DictionaryService:
                 result['definition'] = self._sanitize_translation(result.get('definition', ''), lookup_word, language, allow_blank=True)
                 # If we got good data, use it and skip fallbacks
                 if result.get('translation') or result.get('definition'):
-                    self.cache[cache_key] = dict(result)
+                    self._remember_word_info(cache_key, result)
                     return result
         
         # FALLBACK: Try different dictionary sources based on language
         if language == 'en':
             result = self._get_english_definition(lookup_word, result)
-        elif language in ['it', 'es', 'fr', 'de', 'pt']:
+        elif language in _ROMANCE_LANGUAGES:
             result = self._get_romance_language_info(lookup_word, language, target_language, result, original_word=word_lower)
         else:
             # Generic fallback
@@ -198,9 +572,18 @@ class DictionaryService:
             result['translation'] = self._sanitize_translation(result.get('definition', ''), lookup_word, language)
         result['definition'] = self._sanitize_translation(result.get('definition', ''), lookup_word, language, allow_blank=True)
         
-        self.cache[cache_key] = dict(result)
+        self._remember_word_info(cache_key, result)
         return result
 
+    def _remember_word_info(self, cache_key: Tuple[str, str, str], result: Dict) -> None:
+        """Store a lookup result in the in-memory cache and, if it is a new answer, on disk."""
+        self.cache[cache_key] = dict(result)
+        # Database-backed entries are re-read from the lemmas table, which stays current.
+        # Empty results (provider outage, rate limiting) stay in memory only, so they
+        # don't outlive the process and pin "no translation" for the whole TTL.
+        if result.get('source') != 'database' and (result.get('translation') or result.get('definition')):
+            self._persistent_cache.set("_".join(cache_key), result)
+
     def _should_refresh_cached_definition(self, definition: str, source: str, language: str) -> bool:
         """Return True if cached definition looks like a bad MT artifact."""
         if not definition or language == "en":
@@ -228,32 +611,117 @@ class DictionaryService:
         """
         if not word:
             return word
-        cache_key = f"{language}:{word}"
-        if cache_key in self.normalization_cache:
-            return self.normalization_cache[cache_key]
+        # In-memory keys are tuples (cheaper to hash than formatted strings); the
+        # "language:word" string form is only built for the SQLite layer
+        cache_key = (language, word)
+        cached = self.normalization_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        persisted = self._persistent_normalization_cache.get(f"{language}:{word}")
+        if persisted is not None:
+            self.normalization_cache[cache_key] = persisted
+            return persisted
         
-        normalized = word
         # Strip accents early to improve matches when spaCy isn't available
-        stripped_word = self._strip_accents(word)
-        if stripped_word and stripped_word != word:
-            normalized = stripped_word
-        nlp = self._get_spacy_model(language)
-        if nlp:
-            try:
-                doc = nlp(normalized)
-                if len(doc) > 0:
-                    lemma = doc[0].lemma_.strip()
-                    if lemma and lemma != '-PRON-':
-                        normalized = lemma.lower()
-            except Exception:
-                pass
+        candidate = self._strip_accents(word) or word
+        return self._finish_normalization(word, language, candidate, self._lemma_of(candidate, language))
+    
+    def _finish_normalization(self, word: str, language: str, candidate: str, lemma: Optional[str]) -> str:
+        """Apply the spaCy lemma (if any) and language fixes to candidate, then cache the result."""
+        normalized = candidate
+        lemma = (lemma or '').strip()
+        if lemma and lemma != '-PRON-':
+            normalized = lemma.lower()
         
         if language == 'it':
             normalized = self._normalize_italian_word_form(word, normalized)
         
-        self.normalization_cache[cache_key] = normalized
+        self.normalization_cache[(language, word)] = normalized
+        if lemma:
+            # Only persist spaCy-backed results; heuristic-only ones may improve once a model is installed
+            self._persistent_normalization_cache.set(f"{language}:{word}", normalized)
         return normalized
     
+    def _lemma_of(self, text: str, language: str) -> Optional[str]:
+        """spaCy lemma of text's first token (None without a model), via the fast lemmatizer if enabled."""
+        nlp = self._get_lemma_model(language)
+        if nlp is None:
+            info = self._token_info(text, language)
+            return info[0] if info else None
+        try:
+            doc = nlp(text)
+        except Exception:
+            return None
+        return doc[0].lemma_ if len(doc) > 0 else None
+    
+    def _get_lemma_model(self, language: str):
+        """
+        Lemmatize-only pipeline used for normalization when LEXEME_FAST_LEMMA=1:
+        spacy.blank(language) with a lookup-mode lemmatizer, i.e. a table lookup per
+        token with no tagger inference. Needs the spacy-lookups-data package.
+        
+        Returns None when disabled or unavailable; callers then use the full model,
+        which grammar/POS analysis always uses since they need morphology.
+        """
+        if not self.fast_lemma_enabled:
+            return None
+        if language not in self._lemma_models:
+            nlp = None
+            try:
+                import spacy
+                nlp = spacy.blank(language)
+                nlp.add_pipe("lemmatizer", config={"mode": "lookup"})
+                nlp.initialize()
+            except Exception as exc:
+                print(f"[DictionaryService] Lookup lemmatizer unavailable for '{language}', using full model: {exc}")
+                nlp = None
+            self._lemma_models[language] = nlp
+        return self._lemma_models[language]
+    
+    def _token_info(self, text: str, language: str) -> Optional[Tuple[str, str, Dict[str, str]]]:
+        """
+        (lemma, pos, morph) of the first spaCy token of text, or None without a model/tokens.
+        
+        Memoized per (language, text) so normalization, grammar analysis and POS
+        inference share one parse per word instead of each building its own Doc.
+        """
+        key = (language, text)
+        cached = self._token_info_cache.get(key, _NOT_CACHED)
+        if cached is not _NOT_CACHED:
+            return cached
+        nlp = self._get_spacy_model(language)
+        if nlp is None:
+            return None
+        try:
+            info = self._doc_token_info(nlp(text))
+        except Exception:
+            return None
+        self._token_info_cache[key] = info
+        return info
+    
+    def _prime_token_info(self, texts, language: str) -> None:
+        """Fill the _token_info cache for texts with one nlp.pipe() pass instead of one nlp() call each."""
+        missing = [text for text in texts if text and (language, text) not in self._token_info_cache]
+        if not missing:
+            return
+        nlp = self._get_spacy_model(language)
+        if nlp is None:
+            return
+        try:
+            for text, doc in zip(missing, nlp.pipe(missing, batch_size=256)):
+                self._token_info_cache[(language, text)] = self._doc_token_info(doc)
+        except Exception:
+            pass
+    
+    @staticmethod
+    def _doc_token_info(doc) -> Optional[Tuple[str, str, Dict[str, str]]]:
+        """Extract the plain (lemma, pos, morph) values of a Doc's first token."""
+        if len(doc) == 0:
+            return None
+        token = doc[0]
+        morph = {str(k): str(v) for k, v in token.morph.to_dict().items()} if token.morph else {}
+        return token.lemma_, token.pos_, morph
+    
     def _should_auto_download_spacy(self) -> bool:
         """Check env flag to see if we should download spaCy models at runtime."""
         flag = os.getenv("SPACY_AUTO_DOWNLOAD", "")
@@ -263,34 +731,40 @@ class DictionaryService:
         """Lazily load and cache spaCy models per language."""
         if language in self._spacy_models:
             return self._spacy_models[language]
-        
+        future = _preloaded_models.get(language)
+        if future is not None:
+            # Preload in flight (or done): wait for it rather than loading a second copy
+            try:
+                nlp = future.result()
+            except Exception:
+                # e.g. model not installed: fall through to the load/download path below
+                pass
+            else:
+                self._spacy_models[language] = nlp
+                return nlp
+        return self._load_spacy_model(language)
+
+    def _load_spacy_model(self, language: str):
+        """Load the spaCy model for language (downloading once if enabled) and cache it."""
         try:
             import spacy
         except ImportError:
             self._spacy_models[language] = None
             return None
         
-        model_map = {
-            'en': 'en_core_web_sm',
-            'it': 'it_core_news_sm',
-            'es': 'es_core_news_sm',
-            'fr': 'fr_core_news_sm',
-            'de': 'de_core_news_sm',
-            'pt': 'pt_core_news_sm'
-        }
-        model_name = model_map.get(language, 'en_core_web_sm')
+        model_name = _SPACY_MODEL_NAMES.get(language, 'en_core_web_sm')
         
         if model_name in self._spacy_download_attempted:
             # Avoid repeated download attempts
             try:
-                nlp = spacy.load(model_name)
+                nlp = _load_nlp(model_name, self._spacy_excluded_components)
             except Exception:
                 nlp = None
             self._spacy_models[language] = nlp
             return nlp
         
         try:
-            nlp = spacy.load(model_name)
+            nlp = _load_nlp(model_name, self._spacy_excluded_components)
             self._spacy_models[language] = nlp
             return nlp
         except OSError:
@@ -306,7 +780,7 @@ class DictionaryService:
                 try:
                     from spacy.cli import download
                     download(model_name)
-                    nlp = spacy.load(model_name)
+                    nlp = _load_nlp(model_name, self._spacy_excluded_components)
                 except Exception as exc:
                     print(f"[DictionaryService] Failed to auto-download spaCy model '{model_name}': {exc}")
                     nlp = None
@@ -329,7 +803,7 @@ class DictionaryService:
         if self._looks_like_infinitive(current_normalized):
             return current_normalized
         
-        lower_word = word.lower().replace("’", "").replace("'", "")
+        lower_word = word.lower().translate(_QUOTE_STRIP)
         lower_word_stripped = self._strip_accents(lower_word)
         candidate = current_normalized
         
@@ -382,45 +856,38 @@ class DictionaryService:
             if unicodedata.category(ch) != 'Mn'
         )
     
-    def _strip_italian_clitic(self, word: str) -> Optional[str]:
-        """Remove Italian clitic pronouns from the end of a word to recover the infinitive."""
-        if not word or len(word) < 4:
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _strip_italian_clitic(word: str) -> Optional[str]:
+        """Remove Italian clitic pronouns from the end of a word to recover the infinitive (memoized, pure)."""
+        if not word or len(word) < 4 or not word.endswith(_ITALIAN_CLITIC_SUFFIXES):
             return None
         
-        suffixes = [
-            'gliene', 'gliela', 'glielo', 'glieli', 'gliele',
-            'mene', 'tene', 'cene', 'vene',
-            'mele', 'mela', 'melo', 'meli',
-            'tele', 'tela', 'telo', 'teli',
-            'cele', 'cela', 'celo', 'celi',
-            'gli', 'la', 'le', 'li', 'lo',
-            'mi', 'ti', 'si', 'ci', 'vi', 'ne'
-        ]
-        suffixes.sort(key=len, reverse=True)
-        
-        for suffix in suffixes:
-            if not word.endswith(suffix):
+        # Each length can match at most one clitic (the word's own tail), so this
+        # visits exactly the matching suffixes, longest first
+        for suffix_len in _ITALIAN_CLITIC_LENGTHS:
+            if word[-suffix_len:] not in _ITALIAN_CLITICS:
                 continue
-            stem = word[:-len(suffix)]
+            stem = word[:-suffix_len]
             if len(stem) < 3:
                 continue
             
             # Cases like "conoscerla" -> "conoscere"
             if stem.endswith('r'):
                 candidate = f"{stem}e"
-                if self._looks_like_infinitive(candidate):
+                if DictionaryService._looks_like_infinitive(candidate):
                     return candidate
             
             # Cases like "circondati" -> "circondare"
             if stem[-1] in 'aeiou':
                 candidate = f"{stem}re"
-                if self._looks_like_infinitive(candidate):
+                if DictionaryService._looks_like_infinitive(candidate):
                     return candidate
             
             # Reflexive infinitives like "guardarsi"
             if stem.endswith(('ar', 'er', 'ir')):
                 candidate = f"{stem}e"
-                if self._looks_like_infinitive(candidate):
+                if DictionaryService._looks_like_infinitive(candidate):
                     return candidate
         
         # Handle explicit reflexive infinitives ("chiamarsi")
@@ -430,7 +897,7 @@ class DictionaryService:
                 candidate = f"{stem}e"
             else:
                 candidate = f"{stem}re"
-            if self._looks_like_infinitive(candidate):
+            if DictionaryService._looks_like_infinitive(candidate):
                 return candidate
         
         return None
@@ -473,19 +940,22 @@ class DictionaryService:
                         return candidate
         return None
     
-    def _looks_like_infinitive(self, word: str) -> bool:
+    @staticmethod
+    def _looks_like_infinitive(word: str) -> bool:
         """Check if a word looks like an Italian infinitive."""
         if not word:
             return False
         return word.endswith(('are', 'ere', 'ire'))
     
-    def _clean_translation_text(self, text: str) -> str:
-        """Standardize translation/definition strings and remove noisy formatting."""
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def _clean_translation_text(text: str) -> str:
+        """Standardize translation/definition strings and remove noisy formatting (memoized, pure)."""
         if not text:
             return ''
 
         # Collapse whitespace
-        cleaned = re.sub(r'\s+', ' ', text).strip()
+        cleaned = _WHITESPACE_RE.sub(' ', text).strip()
 
         # Drop common wrappers/punctuation
         cleaned = cleaned.strip('[]')
@@ -493,9 +963,9 @@ class DictionaryService:
         cleaned = cleaned.rstrip('?!.,;:').strip()
 
         # Drop MyMemory sense markers like "-3" appended to translations
-        cleaned = re.sub(r'-\d+$', '', cleaned)
+        cleaned = _TRAILING_SENSE_NUMBER_RE.sub('', cleaned)
         # Remove trailing numeric qualifiers in parentheses
-        cleaned = re.sub(r'\s*\(\d+\)$', '', cleaned)
+        cleaned = _TRAILING_PAREN_NUMBER_RE.sub('', cleaned)
 
         # Normalize shouting responses (e.g., ROUTES -> routes) but keep acronyms
         if cleaned and cleaned.isupper() and ' ' not in cleaned and len(cleaned) > 2:
@@ -516,35 +986,99 @@ class DictionaryService:
         if not word or source_lang == target_lang:
             return None
 
-        urls = endpoints or [
-            'https://libretranslate.com/translate',
-            'https://translate.argosopentech.com/translate',
-        ]
+        urls = endpoints or _LIBRETRANSLATE_ENDPOINTS
+        return self._first_available(
+            [lambda url=url: self._query_libretranslate(url, word, source_lang, target_lang) for url in urls]
+        )
 
-        for url in urls:
-            try:
-                time.sleep(self.rate_limit_delay)
-                response = requests.post(
-                    url,
-                    json={
-                        'q': word,
-                        'source': source_lang,
-                        'target': target_lang,
-                        'format': 'text'
-                    },
-                    timeout=5,
-                    headers={'Content-Type': 'application/json'}
-                )
-                if response.status_code == 200:
-                    data = response.json()
-                    translation = data.get('translatedText') or data.get('translation')
-                    translation = self._clean_translation_text(translation)
-                    if translation and translation.lower() != word.lower():
-                        return translation
-            except Exception:
-                continue
+    def _query_libretranslate(self, url: str, word: str, source_lang: str, target_lang: str) -> Optional[str]:
+        """Query a single LibreTranslate instance. Returns a cleaned translation or None."""
+        try:
+            self._rate_limiter.wait(url)
+            response = self._http.post(
+                url,
+                json={
+                    'q': word,
+                    'source': source_lang,
+                    'target': target_lang,
+                    'format': 'text'
+                },
+                timeout=5,
+                headers={'Content-Type': 'application/json'}
+            )
+            if response.status_code == 200:
+                data = fast_json.loads(response.content)
+                translation = data.get('translatedText') or data.get('translation')
+                translation = self._clean_translation_text(translation)
+                if translation and translation.lower() != word.lower():
+                    return translation
+        except Exception:
+            pass
         return None
 
+    def _first_available(self, calls: List[Callable[[], Optional[str]]]):
+        """
+        Hedged provider calls: return the first non-empty result in priority (list) order.
+        
+        Only the top-priority call starts right away. The next one is started when every
+        call already running has failed, or when _PROVIDER_HEDGE_DELAY passes without an
+        answer, so a healthy primary provider costs a single request while a slow or
+        dead one still doesn't stall the lookup for its full timeout. Once a lower-priority
+        call has answered, the ones ahead of it get one more _PROVIDER_HEDGE_DELAY to
+        finish before that answer is returned.
+        """
+        if len(calls) == 1:
+            return calls[0]()
+        remaining = list(calls)
+        futures = [self._http_pool.submit(remaining.pop(0))]
+        backup_deadline = None
+        try:
+            while True:
+                running = None
+                backup = None
+                for future in futures:
+                    if not future.done():
+                        if running is None:
+                            running = future
+                        continue
+                    try:
+                        value = future.result()
+                    except Exception:
+                        value = None
+                    if value:
+                        if running is None:
+                            return value
+                        # Answered, but a higher-priority call is still running
+                        backup = value
+                        break
+                if running is None:
+                    # Everything started so far failed: fall through to the next provider
+                    if not remaining:
+                        return None
+                    futures.append(self._http_pool.submit(remaining.pop(0)))
+                    continue
+                in_flight = [future for future in futures if not future.done()]
+                if backup is not None:
+                    # Give the calls ahead of the backup answer a bounded grace period
+                    now = time.monotonic()
+                    if backup_deadline is None:
+                        backup_deadline = now + _PROVIDER_HEDGE_DELAY
+                    if now >= backup_deadline:
+                        return backup
+                    wait(in_flight, timeout=backup_deadline - now, return_when=FIRST_COMPLETED)
+                    continue
+                done, _ = wait(
+                    in_flight,
+                    timeout=_PROVIDER_HEDGE_DELAY if remaining else None,
+                    return_when=FIRST_COMPLETED,
+                )
+                if not done and remaining:
+                    # No answer within the hedge delay: start the next provider alongside
+                    futures.append(self._http_pool.submit(remaining.pop(0)))
+        finally:
+            for future in futures:
+                future.cancel()
+
     def _looks_like_bad_translation(self, translation: str, source: str, language: str) -> bool:
         """Heuristic check to flag noisy or clearly wrong translations."""
         if not translation:
@@ -627,35 +1161,40 @@ class DictionaryService:
         if not word:
             return False
         
-        translation = self._translate_via_libretranslate(word, source_lang, target_lang)
-        if translation:
-            result['translation'] = translation
-            result['definition'] = translation
-            result['source'] = 'libretranslate'
-            return True
-
-        translation = self._query_mymemory(word, source_lang, target_lang)
-        if translation:
+        # LibreTranslate instances first, then MyMemory; later ones only on failure or hedge timeout
+        calls = [
+            lambda url=url: self._tagged(self._query_libretranslate(url, word, source_lang, target_lang), 'libretranslate')
+            for url in _LIBRETRANSLATE_ENDPOINTS
+        ]
+        calls.append(lambda: self._tagged(self._query_mymemory(word, source_lang, target_lang), 'mymemory'))
+        found = self._first_available(calls)
+        if found:
+            translation, source = found
             result['translation'] = translation
             result['definition'] = translation
-            result['source'] = 'mymemory'
+            result['source'] = source
             return True
         
         return False
     
+    @staticmethod
+    def _tagged(translation: Optional[str], source: str) -> Optional[Tuple[str, str]]:
+        """Pair a provider's translation with its source name (None if it found nothing)."""
+        return (translation, source) if translation else None
+    
     def _query_mymemory(self, word: str, source_lang: str, target_lang: str) -> Optional[str]:
         """Query MyMemory translation API and return a cleaned translation if available."""
         try:
-            time.sleep(self.rate_limit_delay)
             if source_lang == target_lang:
                 return None
-            response = requests.get(
-                "https://api.mymemory.translated.net/get",
+            self._rate_limiter.wait(_MYMEMORY_URL)
+            response = self._http.get(
+                _MYMEMORY_URL,
                 params={'q': word, 'langpair': f"{source_lang}|{target_lang}"},
                 timeout=5
             )
             if response.status_code == 200:
-                data = response.json()
+                data = fast_json.loads(response.content)
                 translation = data.get('responseData', {}).get('translatedText')
                 translation = self._clean_translation_text(translation)
                 if (translation and
@@ -663,20 +1202,21 @@ class DictionaryService:
                     not translation.startswith('[')):
                     return translation
         except Exception as e:
-            print(f"Translation API error for {word}: {e}")
+            logger.debug("Translation API error for %s: %s", word, e)
         return None
     
     def _get_english_definition(self, word: str, result: Dict) -> Dict:
         """Get English word definition using Free Dictionary API."""
         try:
-            time.sleep(self.rate_limit_delay)
-            response = requests.get(
-                f"https://api.dictionaryapi.dev/api/v2/entries/en/{word}",
+            url = f"https://api.dictionaryapi.dev/api/v2/entries/en/{word}"
+            self._rate_limiter.wait(url)
+            response = self._http.get(
+                url,
                 timeout=5
             )
             
             if response.status_code == 200:
-                data = response.json()
+                data = fast_json.loads(response.content)
                 if data and len(data) > 0:
                     entry = data[0]
                     
@@ -685,24 +1225,19 @@ class DictionaryService:
                         meaning = entry['meanings'][0]
                         result['part_of_speech'] = meaning.get('partOfSpeech', '')
                         
-                        if 'definitions' in meaning and len(meaning['definitions']) > 0:
-                            definition = meaning['definitions'][0]
-                            result['definition'] = definition.get('definition', '')
-                            
-                            # Get example if available
-                            if 'example' in definition:
-                                result['examples'].append(definition['example'])
-                        
-                        # Get all definitions for this POS
-                        all_definitions = [d.get('definition', '') for d in meaning.get('definitions', [])]
-                        if all_definitions:
-                            result['definition'] = '; '.join(all_definitions[:3])  # Limit to 3
+                        definitions = meaning.get('definitions') or []
+                        if definitions:
+                            # Get example of the first definition if available
+                            if 'example' in definitions[0]:
+                                result['examples'].append(definitions[0]['example'])
+                            # Join the first few definitions for this POS (limit to 3)
+                            result['definition'] = '; '.join(d.get('definition', '') for d in islice(definitions, 3))
                     
                     result['translation'] = result['definition']  # For English, definition is translation
                     result['source'] = 'dictionaryapi.dev'
                     
         except Exception as e:
-            print(f"Dictionary API error for {word}: {e}")
+            logger.debug("Dictionary API error for %s: %s", word, e)
         
         return result
     
@@ -715,11 +1250,24 @@ class DictionaryService:
         if original_word and original_word not in candidates:
             candidates.append(original_word)
         
-        for candidate in candidates:
-            if self._lookup_translation(candidate, source_lang, target_lang, result):
-                translation_found = True
-                result['matched_word'] = candidate
-                break
+        common = _COMMON_TRANSLATIONS.get((source_lang, target_lang))
+        if common:
+            for candidate in candidates:
+                translation = common.get(candidate)
+                if translation:
+                    result['translation'] = translation
+                    result['definition'] = translation
+                    result['source'] = 'builtin_dict'
+                    result['matched_word'] = candidate
+                    translation_found = True
+                    break
+        
+        if not translation_found:
+            for candidate in candidates:
+                if self._lookup_translation(candidate, source_lang, target_lang, result):
+                    translation_found = True
+                    result['matched_word'] = candidate
+                    break
         
         if not translation_found:
             for fallback_word in candidates:
@@ -738,13 +1286,7 @@ class DictionaryService:
         # Ensure we have a part of speech
         if not result.get('part_of_speech') and grammar_info.get('type'):
             # Map grammar type to POS
-            pos_map = {
-                'verb': 'VERB',
-                'noun/adjective': 'NOUN',
-                'article': 'DET',
-                'preposition': 'ADP'
-            }
-            result['part_of_speech'] = pos_map.get(grammar_info.get('type'), 'NOUN')
+            result['part_of_speech'] = _GRAMMAR_TYPE_TO_POS.get(grammar_info.get('type'), 'NOUN')
         
         # If still no POS, infer from word characteristics
         if not result.get('part_of_speech'):
@@ -755,143 +1297,41 @@ class DictionaryService:
     def _analyze_romance_grammar(self, word: str, language: str) -> Dict:
         """Analyze grammar using spaCy morphological features (most accurate)."""
         grammar = {}
-        
-        # Try to use spaCy for morphological analysis
-        try:
-            import spacy
-            spacy_models = {
-                'en': 'en_core_web_sm',
-                'it': 'it_core_news_sm',
-                'es': 'es_core_news_sm',
-                'fr': 'fr_core_news_sm',
-                'de': 'de_core_news_sm',
-            }
-            model_name = spacy_models.get(language, 'en_core_web_sm')
-            try:
-                nlp = spacy.load(model_name)
-                doc = nlp(word.lower())
-                if len(doc) > 0:
-                    token = doc[0]
-                    morph = token.morph
-                    
-                    # Extract morphological features from spaCy
-                    if morph:
-                        morph_dict = morph.to_dict()
-                        grammar.update({str(k): str(v) for k, v in morph_dict.items()})
-                    
-                    # Add POS-based type
-                    pos = token.pos_
-                    if pos == 'DET':
-                        grammar['type'] = 'article'
-                    elif pos == 'ADP':
-                        grammar['type'] = 'preposition'
-                    elif pos == 'VERB':
-                        grammar['type'] = 'verb'
-                    elif pos in ['NOUN', 'ADJ']:
-                        grammar['type'] = 'noun/adjective'
-                    
-                    return grammar
-            except (OSError, ImportError):
-                pass  # Fall through to heuristics
-        except ImportError:
-            pass  # spaCy not available, use heuristics
-        
-        # Basic heuristics as fallback (only if spaCy unavailable)
         word_lower = word.lower()
         
-        if language == 'it':  # Italian
-            # Articles
-            if word_lower in ['il', 'lo', 'la', 'i', 'gli', 'le']:
-                grammar['type'] = 'article'
-                grammar['definite'] = True
-                if word_lower in ['il', 'lo', 'i', 'gli']:
-                    grammar['gender'] = 'masculine'
-                else:
-                    grammar['gender'] = 'feminine'
-                if word_lower in ['il', 'lo', 'la']:
-                    grammar['number'] = 'singular'
-                else:
-                    grammar['number'] = 'plural'
-            elif word_lower in ['un', 'uno', 'una', "un'"]:
+        # Try to use spaCy for morphological analysis (shared per-word parse, see _token_info)
+        info = self._token_info(word_lower, language)
+        if info is not None:
+            _, pos, morph = info
+            # Extract morphological features from spaCy
+            grammar.update(morph)
+            
+            # Add POS-based type
+            if pos == 'DET':
                 grammar['type'] = 'article'
-                grammar['definite'] = False
-                if word_lower in ['un', 'uno']:
-                    grammar['gender'] = 'masculine'
-                else:
-                    grammar['gender'] = 'feminine'
-                grammar['number'] = 'singular'
-            # Prepositions
-            elif word_lower in ['di', 'a', 'da', 'in', 'con', 'su', 'per', 'tra', 'fra']:
+            elif pos == 'ADP':
                 grammar['type'] = 'preposition'
-            # Verb endings
-            elif word_lower.endswith('are'):
-                grammar['type'] = 'verb'
-                grammar['conjugation'] = '1st (-are)'
-                grammar['form'] = 'infinitive'
-            elif word_lower.endswith('ere'):
-                grammar['type'] = 'verb'
-                grammar['conjugation'] = '2nd (-ere)'
-                grammar['form'] = 'infinitive'
-            elif word_lower.endswith('ire'):
-                grammar['type'] = 'verb'
-                grammar['conjugation'] = '3rd (-ire)'
-                grammar['form'] = 'infinitive'
-            # Noun/adjective endings
-            elif word_lower.endswith('o'):
-                grammar['type'] = 'noun/adjective'
-                grammar['gender'] = 'masculine'
-                grammar['number'] = 'singular'
-            elif word_lower.endswith('a'):
-                grammar['type'] = 'noun/adjective'
-                grammar['gender'] = 'feminine'
-                grammar['number'] = 'singular'
-            elif word_lower.endswith('i'):
-                grammar['type'] = 'noun/adjective'
-                grammar['gender'] = 'masculine'
-                grammar['number'] = 'plural'
-            elif word_lower.endswith('e'):
-                grammar['type'] = 'noun/adjective'
-                grammar['gender'] = 'feminine'
-                grammar['number'] = 'plural'
-        
-        elif language == 'es':  # Spanish
-            # Verb endings
-            if word_lower.endswith('ar'):
-                grammar['type'] = 'verb'
-                grammar['conjugation'] = '1st (-ar)'
-                grammar['form'] = 'infinitive'
-            elif word_lower.endswith('er'):
-                grammar['type'] = 'verb'
-                grammar['conjugation'] = '2nd (-er)'
-                grammar['form'] = 'infinitive'
-            elif word_lower.endswith('ir'):
+            elif pos == 'VERB':
                 grammar['type'] = 'verb'
-                grammar['conjugation'] = '3rd (-ir)'
-                grammar['form'] = 'infinitive'
-            # Noun/adjective endings
-            elif word_lower.endswith('o'):
+            elif pos in ('NOUN', 'ADJ'):
                 grammar['type'] = 'noun/adjective'
-                grammar['gender'] = 'masculine'
-                grammar['number'] = 'singular'
-            elif word_lower.endswith('a'):
-                grammar['type'] = 'noun/adjective'
-                grammar['gender'] = 'feminine'
-                grammar['number'] = 'singular'
+            
+            return grammar
         
-        elif language == 'fr':  # French
-            # Verb endings
-            if word_lower.endswith('er'):
-                grammar['type'] = 'verb'
-                grammar['conjugation'] = '1st (-er)'
-                grammar['form'] = 'infinitive'
-            elif word_lower.endswith('ir'):
-                grammar['type'] = 'verb'
-                grammar['conjugation'] = '2nd (-ir)'
-                grammar['form'] = 'infinitive'
-            elif word_lower.endswith('re'):
-                grammar['type'] = 'verb'
-                grammar['conjugation'] = '3rd (-re)'
-                grammar['form'] = 'infinitive'
+        # Basic heuristics as fallback (only if spaCy unavailable)
+        if language == 'it' and word_lower in _IT_ARTICLES:
+            grammar.update(_IT_ARTICLES[word_lower])
+        elif language == 'it' and word_lower in _IT_PREPOSITIONS:
+            grammar['type'] = 'preposition'
+        else:
+            # Verb / noun-adjective endings: longest suffix first, one dict probe per length
+            suffix_table = _SUFFIX_GRAMMAR.get(language)
+            if suffix_table:
+                for suffix_len in (3, 2, 1):
+                    entry = suffix_table.get(word_lower[-suffix_len:])
+                    if entry:
+                        grammar.update(entry)
+                        break
         
         return grammar
     
@@ -908,24 +1348,11 @@ class DictionaryService:
                 result['source'] = 'libretranslate'
             else:
                 # Try MyMemory only if LibreTranslate failed
-                try:
-                    time.sleep(self.rate_limit_delay)
-                    response = requests.get(
-                        "https://api.mymemory.translated.net/get",
-                        params={'q': word, 'langpair': f"{source_lang}|{target_lang}"},
-                        timeout=5
-                    )
-                    
-                    if response.status_code == 200:
-                        data = response.json()
-                        if 'responseData' in data and 'translatedText' in data['responseData']:
-                            translation = self._clean_translation_text(data['responseData']['translatedText'])
-                            if translation:
-                                result['translation'] = translation
-                                result['definition'] = translation
-                                result['source'] = 'mymemory'
-                except Exception as e:
-                    print(f"Translation error for {word}: {e}")
+                translation = self._query_mymemory(word, source_lang, target_lang)
+                if translation:
+                    result['translation'] = translation
+                    result['definition'] = translation
+                    result['source'] = 'mymemory'
 
             if not result.get('translation'):
                 result = self._get_fallback_translation(word, source_lang, target_lang, result)
@@ -938,10 +1365,11 @@ class DictionaryService:
         
         # Try WordReference API (free, no key required for basic lookups)
         try:
-            time.sleep(self.rate_limit_delay * 0.5)  # Faster for first attempt
+            url = f"https://www.wordreference.com/iten/{word_lower}"
+            self._rate_limiter.wait(url)
             # WordReference has a public API endpoint
-            response = requests.get(
-                f"https://www.wordreference.com/iten/{word_lower}",
+            response = self._http.get(
+                url,
                 timeout=5,
                 headers={'User-Agent': 'Mozilla/5.0'}
             )
@@ -950,7 +1378,7 @@ class DictionaryService:
                 html = response.text
                 # Look for translation patterns in WordReference HTML
                 # This is a simple extraction - could be improved
-                translation_match = re.search(r'<td class="ToWrd">([^<]+)</td>', html)
+                translation_match = _WORDREFERENCE_TRANSLATION_RE.search(html)
                 if translation_match:
                     translation = self._clean_translation_text(translation_match.group(1))
                     if translation and translation.lower() != word_lower:
@@ -959,7 +1387,7 @@ class DictionaryService:
                         result['source'] = 'wordreference'
                         return result
         except Exception as e:
-            print(f"WordReference lookup error for {word}: {e}")
+            logger.debug("WordReference lookup error for %s: %s", word, e)
         # Skip curated built-in dictionary entries; rely on translation sources only
         return result
     
@@ -985,39 +1413,22 @@ class DictionaryService:
     
     def _infer_pos_from_word(self, word: str, language: str) -> str:
         """Infer part of speech using spaCy if available, otherwise basic heuristics."""
-        # Try to use spaCy for accurate POS tagging
-        try:
-            import spacy
-            spacy_models = {
-                'en': 'en_core_web_sm',
-                'it': 'it_core_news_sm',
-                'es': 'es_core_news_sm',
-                'fr': 'fr_core_news_sm',
-                'de': 'de_core_news_sm',
-            }
-            model_name = spacy_models.get(language, 'en_core_web_sm')
-            try:
-                nlp = spacy.load(model_name)
-                doc = nlp(word.lower())
-                if len(doc) > 0:
-                    pos = doc[0].pos_
-                    if pos and pos != 'X':
-                        return pos.upper()
-            except (OSError, ImportError):
-                pass  # Fall through to heuristics
-        except ImportError:
-            pass  # spaCy not available, use heuristics
-        
-        # Basic heuristics as fallback (only if spaCy unavailable)
         word_lower = word.lower()
+        # Try to use spaCy for accurate POS tagging (shared per-word parse, see _token_info)
+        info = self._token_info(word_lower, language)
+        if info is not None:
+            pos = info[1]
+            if pos and pos != 'X':
+                return pos.upper()
         
+        # Basic heuristics as fallback (only if spaCy unavailable)
         if language == 'it':
             # Very common function words
-            if word_lower in ['il', 'lo', 'la', 'i', 'gli', 'le', 'un', 'uno', 'una', "un'"]:
+            if word_lower in _IT_ARTICLES:
                 return 'DET'
-            if word_lower in ['di', 'a', 'da', 'in', 'con', 'su', 'per', 'tra', 'fra']:
+            if word_lower in _IT_PREPOSITIONS:
                 return 'ADP'
-            if word_lower in ['e', 'o', 'ma', 'perché', 'che', 'quando', 'dove']:
+            if word_lower in _IT_CONJUNCTIONS:
                 return 'CONJ'
             if word_lower.endswith(('are', 'ere', 'ire')):
                 return 'VERB'
@@ -1244,7 +1655,7 @@ class DictionaryService:
                 conjugation = grammar.get('conjugation', '')
                 if conjugation:
                     tips.append(f"Verb conjugation: {conjugation}")
-            elif pos in ['noun', 'adj']:
+            elif pos in ('noun', 'adj'):
                 gender = grammar.get('gender', '')
                 if gender:
                     tips.append(f"Gender: {gender}")
@@ -1256,10 +1667,85 @@ class DictionaryService:
         
         return '; '.join(tips) if tips else None
     
-    def batch_get_word_info(self, words: List[str], language: str, target_language: str = "en") -> Dict[str, Dict]:
-        """Get information for multiple words efficiently."""
+    def batch_get_word_info(self, words: List[str], language: str, target_language: str = "en", db = None) -> Dict[str, Dict]:
+        """
+        Get information for multiple words efficiently.
+        
+        With a database session (db, or the one given at construction) the stored lemmas
+        for the whole batch are resolved with one IN query instead of one SELECT per word.
+        """
+        language_key = (language or "en").lower()
+        # Look up each case/whitespace variant once (first spelling wins), then fan results back out
+        unique = {}
+        for word in words:
+            unique.setdefault((word or "").strip().lower(), word)
+        originals = list(unique.values())
+        # Warm the normalization cache with one batched spaCy pass
+        normalized = self.normalize_word_forms(originals, language)
+        if language_key in _ROMANCE_LANGUAGES:
+            # Grammar/POS analysis parses the surface form and the lemma; batch those too
+            texts = {key for key in unique if key}
+            texts.update(normalized.values())
+            self._prime_token_info(texts, language_key)
+        serial = False
+        db_cache_only = False
+        db_to_use = db or self._db_session
+        if db_to_use is not None:
+            # One IN query up front; the workers below then read only that prefetched
+            # cache and never touch the (thread-unsafe) Session themselves
+            db_cache_only = self._prefetch_db_lemmas(db_to_use, set(normalized.values()), language_key)
+            serial = not db_cache_only
+        if serial or len(originals) <= 1:
+            infos = [self.get_word_info(word, language, target_language, db=db) for word in originals]
+        else:
+            # Lookups are network-bound: fan them out and let the per-host rate limiter pace them
+            with ThreadPoolExecutor(max_workers=min(_BATCH_LOOKUP_WORKERS, len(originals))) as pool:
+                infos = list(pool.map(
+                    lambda word: self.get_word_info(word, language, target_language, db_cache_only=db_cache_only),
+                    originals,
+                ))
+        if db_to_use is not None:
+            self.clear_db_lemma_misses()
+        fetched = dict(zip(unique, infos))
         results = {}
         for word in words:
-            results[word] = self.get_word_info(word, language, target_language)
+            info = fetched[(word or "").strip().lower()]
+            # Each spelling gets its own dict carrying its own surface form
+            results[word] = {**info, 'word': (word or "").strip() or info['word']}
         return results
 
+    def prefetch_db_lemmas(self, words, language: str, db) -> bool:
+        """
+        Resolve the stored lemmas for words (after normalization) with chunked IN queries,
+        so following get_word_info(..., db=db) calls skip their per-word SELECT.
+        Returns False if the query failed.
+        """
+        language = (language or "en").lower()
+        normalized = self.normalize_word_forms(list(words), language)
+        return self._prefetch_db_lemmas(db, set(normalized.values()), language)
+
+    def _prefetch_db_lemmas(self, db, lookup_words, language: str) -> bool:
+        """
+        Load stored lemmas for lookup_words into the DB lookup cache and start a new miss
+        scope with the ones that aren't stored. Returns False if the query failed.
+        """
+        missing = [word for word in lookup_words if word and (word, language) not in self._db_lemma_cache]
+        if not missing:
+            self._db_lemma_misses = set()
+            return True
+        from ..models.lemma import Lemma
+        try:
+            # Chunked to stay under SQLite's bound-parameter limit
+            for start in range(0, len(missing), 500):
+                chunk = missing[start:start + 500]
+                self.prime_lemma_cache(
+                    db.query(Lemma).filter(Lemma.language == language, Lemma.lemma.in_(chunk)).all()
+                )
+        except Exception as e:
+            logger.warning("[DictionaryService] Database prefetch error: %s", e)
+            return False
+        self._db_lemma_misses = {
+            (word, language) for word in missing if (word, language) not in self._db_lemma_cache
+        }
+        return True
+
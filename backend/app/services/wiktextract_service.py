@@ -2,11 +2,14 @@
 Wiktextract service for parsing Wiktionary pages directly.
 Uses wiktextract Python library to extract structured data from Wiktionary.
 """
+import re
 import requests
 from typing import Dict, List, Optional
 import time
 import json
 
+from ..utils import fast_json
+
 # Try to import wiktextract
 try:
     import wiktextract
@@ -59,6 +62,9 @@ class WiktextractService:
         self.timeout = timeout
         self.rate_limit_delay = rate_limit_delay
         self._cache = {}
+        # Reuse one keep-alive connection pool for all Wiktionary API calls
+        self._http = requests.Session()
+        self._http.headers["User-Agent"] = "tuttora-app/1.0 (dictionary lookup)"
         
         if not WIKTEXTRACT_AVAILABLE:
             print("[WiktextractService] wiktextract library not available")
@@ -142,21 +148,18 @@ class WiktextractService:
                 'rvslots': 'main',
             }
             
-            response = requests.get(
+            # The session sends an explicit User-Agent: Wiktionary is more reliable
+            # with one, and some requests may be blocked/throttled without it.
+            response = self._http.get(
                 api_url,
                 params=params,
                 timeout=self.timeout,
-                headers={
-                    # Wiktionary is more reliable with an explicit UA; some
-                    # requests may be blocked/throttled without it.
-                    "User-Agent": "tuttora-app/1.0 (dictionary lookup)"
-                },
             )
             
             if response.status_code != 200:
                 return None
             
-            data = response.json()
+            data = fast_json.loads(response.content)
             pages = data.get('query', {}).get('pages', {})
             
             # Get the first (and usually only) page
@@ -233,8 +236,6 @@ class WiktextractService:
         Enhanced extraction from wikitext when full wiktextract parsing fails.
         Extracts ALL relevant information: definitions, translations, forms, conjugations, related terms.
         """
-        import re
-        
         result = {
             'word': word,
             'translation': '',
@@ -490,7 +491,6 @@ class WiktextractService:
         lang_name = lang_name_map.get(language.lower(), language.capitalize())
         
         # Simple regex to find language section
-        import re
         pattern = rf'==\s*{re.escape(lang_name)}\s*=='
         match = re.search(pattern, wikitext, re.IGNORECASE)
         
@@ -0,0 +1,33 @@
+"""
+JSON helpers that use orjson when it is installed and fall back to the stdlib.
+
+Used for provider API responses and the persistent lookup cache, where JSON
+decoding is a noticeable share of CPU once the network is no longer the bottleneck.
+"""
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Decode JSON from bytes or str."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(value: Any) -> str:
+    """Encode value as JSON text."""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(value).decode("utf-8")
+        except TypeError:
+            # orjson is stricter (e.g. non-str dict keys); let the stdlib handle those
+            pass
+    return json.dumps(value)
@@ -0,0 +1,52 @@
+"""
+Size-bounded dict with least-recently-used eviction.
+
+Drop-in replacement for the plain dict caches used by long-lived services so
+their working set stays bounded as new words accumulate.
+"""
+import threading
+from collections import OrderedDict
+
+
+class LRUDict(OrderedDict):
+    """
+    OrderedDict that keeps at most `maxsize` entries.
+
+    Reads through `[]` / `get()` mark an entry as recently used; inserting past
+    the limit evicts the least recently used entry in O(1).
+
+    Thread-safe for the cache operations used by the services (`[]`, `get`,
+    assignment, `pop`): each runs its read/move/evict sequence under one lock, so
+    concurrent batch workers can't interleave a move_to_end with an eviction.
+    A bare `key in cache` check is not locked; use `get()` when the entry may be
+    evicted between the check and the read.
+    """
+
+    def __init__(self, maxsize: int = 10000):
+        super().__init__()
+        self.maxsize = maxsize
+        self._lock = threading.RLock()
+
+    def __getitem__(self, key):
+        with self._lock:
+            value = super().__getitem__(key)
+            self.move_to_end(key)
+            return value
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self:
+                return default
+            self.move_to_end(key)
+            return super().__getitem__(key)
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            super().__setitem__(key, value)
+            self.move_to_end(key)
+            if len(self) > self.maxsize:
+                self.popitem(last=False)
+
+    def pop(self, key, *default):
+        with self._lock:
+            return super().pop(key, *default)
@@ -0,0 +1,88 @@
+"""
+Small persistent key/value cache backed by SQLite.
+
+Used to keep expensive lookups (translations, dictionary results) across
+process restarts. Values are stored as JSON text.
+"""
+import sqlite3
+import threading
+import time
+from typing import Any, Optional
+
+from . import fast_json
+
+
+class SqliteCache:
+    """
+    Thread-safe JSON key/value store in a single SQLite table.
+
+    Failures (read-only filesystem, corrupt file, ...) are logged once and the
+    cache degrades to a no-op so callers never have to handle storage errors.
+    """
+
+    def __init__(self, path: str, table: str = "cache", ttl_seconds: Optional[int] = None):
+        self.path = path
+        self.table = table
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._conn = None
+        try:
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            # WAL + NORMAL sync: each set() commits without a full fsync, so the
+            # one-row-per-lookup writes from concurrent batch lookups stay cheap
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            with self._conn:
+                self._conn.execute(
+                    f"CREATE TABLE IF NOT EXISTS {table} "
+                    "(key TEXT PRIMARY KEY, value TEXT NOT NULL, ts INTEGER NOT NULL)"
+                )
+        except sqlite3.Error as exc:
+            print(f"[SqliteCache] Disabled persistent cache at '{path}': {exc}")
+            self._conn = None
+
+    def purge_expired(self) -> None:
+        """Delete entries older than the TTL (no-op without a TTL)."""
+        if self._conn is None or not self.ttl_seconds:
+            return
+        try:
+            with self._lock, self._conn:
+                self._conn.execute(
+                    f"DELETE FROM {self.table} WHERE ts <= ?",
+                    (int(time.time()) - self.ttl_seconds,),
+                )
+        except sqlite3.Error:
+            pass
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for key, or None if missing/expired."""
+        if self._conn is None:
+            return None
+        try:
+            with self._lock:
+                if self.ttl_seconds:
+                    row = self._conn.execute(
+                        f"SELECT value FROM {self.table} WHERE key = ? AND ts > ?",
+                        (key, int(time.time()) - self.ttl_seconds),
+                    ).fetchone()
+                else:
+                    row = self._conn.execute(
+                        f"SELECT value FROM {self.table} WHERE key = ?", (key,)
+                    ).fetchone()
+            return fast_json.loads(row[0]) if row else None
+        except (sqlite3.Error, ValueError):
+            return None
+
+    def set(self, key: str, value: Any) -> None:
+        """Store value under key (overwrites existing entries)."""
+        if self._conn is None:
+            return
+        try:
+            payload = fast_json.dumps(value)
+            with self._lock, self._conn:
+                self._conn.execute(
+                    f"INSERT OR REPLACE INTO {self.table} (key, value, ts) VALUES (?, ?, ?)",
+                    (key, payload, int(time.time())),
+                )
+        except (sqlite3.Error, TypeError, ValueError):
+            pass
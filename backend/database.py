@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, make_url
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import QueuePool, StaticPool
 import os
@@ -17,6 +17,15 @@ if DATABASE_URL.startswith("sqlite"):
     )
 else:
     # PostgreSQL/MySQL: Use connection pooling
+    engine_options = {}
+    if make_url(DATABASE_URL).get_driver_name() == "psycopg2":
+        # Batch executemany: INSERTs become multi-VALUES statements and UPDATEs
+        # (e.g. existing lemmas touched during vocabulary saves) go through execute_batch
+        engine_options.update(
+            executemany_mode="values_plus_batch",
+            insertmanyvalues_page_size=1000,
+            executemany_batch_page_size=500,
+        )
     engine = create_engine(
         DATABASE_URL,
         poolclass=QueuePool,
@@ -24,6 +33,7 @@ else:
         max_overflow=20,  # Max connections beyond pool_size
         pool_pre_ping=True,  # Verify connections before using
         pool_recycle=3600,  # Recycle connections after 1 hour
+        **engine_options,
     )
 
 # Create SessionLocal class
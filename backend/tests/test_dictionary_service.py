@@ -0,0 +1,256 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+from app.services.dictionary_service import DictionaryService, _HostRateLimiter
+
+
+class DictionaryServiceTestCase(unittest.TestCase):
+    """Builds a DictionaryService with a throwaway cache file and no network providers."""
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        env = mock.patch.dict(os.environ, {
+            "DICTIONARY_CACHE_PATH": os.path.join(tmp.name, "dictionary_cache.sqlite"),
+            "LEXEME_PRELOAD_LANGS": "",
+        })
+        env.start()
+        self.addCleanup(env.stop)
+        self.service = DictionaryService()
+        self.service.wiktextract_service = None
+        self.service.kaikki_service = None
+        # Keep spaCy and HTTP out of the picture
+        self.service._get_spacy_model = mock.Mock(return_value=None)
+        self.service._http = mock.Mock(
+            get=mock.Mock(side_effect=AssertionError("unexpected HTTP GET")),
+            post=mock.Mock(side_effect=AssertionError("unexpected HTTP POST")),
+        )
+
+
+class BatchDatabasePrefetchTest(DictionaryServiceTestCase):
+    def test_prefetched_lemmas_are_served_from_the_database_by_workers(self):
+        for word in ("casa", "libro"):
+            self.service.normalization_cache[("it", word)] = word
+        self.service.prime_lemma_cache([
+            SimpleNamespace(lemma="casa", language="it", definition="house", pos="NOUN", morphology=None),
+            SimpleNamespace(lemma="libro", language="it", definition="book", pos="NOUN", morphology=None),
+        ])
+        db = mock.Mock()
+        providers = mock.patch.object(
+            self.service, "_get_romance_language_info", side_effect=AssertionError("provider called")
+        )
+
+        with providers:
+            results = self.service.batch_get_word_info(["casa", "libro"], "it", "en", db=db)
+
+        self.assertEqual(results["casa"]["source"], "database")
+        self.assertEqual(results["casa"]["translation"], "house")
+        self.assertEqual(results["libro"]["source"], "database")
+        self.assertEqual(results["libro"]["translation"], "book")
+        # Everything was prefetched, so the session is never queried (least of all from workers)
+        db.query.assert_not_called()
+
+
+class DatabaseLemmaCacheTest(DictionaryServiceTestCase):
+    def _session_returning(self, row):
+        db = mock.Mock()
+        db.query.return_value.filter.return_value.first.return_value = row
+        return db
+
+    def test_misses_are_not_cached_outside_a_prefetch(self):
+        db = self._session_returning(None)
+        self.assertIsNone(self.service._lookup_db_lemma(db, "casa", "it"))
+        self.assertIsNone(self.service._lookup_db_lemma(db, "casa", "it"))
+        self.assertEqual(db.query.call_count, 2)
+
+    def test_invalidate_drops_updated_rows(self):
+        row = SimpleNamespace(lemma="casa", language="it", definition="house", pos="NOUN", morphology=None)
+        self.service.prime_lemma_cache([row])
+        self.service.invalidate_lemma_cache(["casa"], "it")
+        db = self._session_returning(
+            SimpleNamespace(lemma="casa", language="it", definition="home", pos="NOUN", morphology=None)
+        )
+        self.assertEqual(self.service._lookup_db_lemma(db, "casa", "it")[0], "home")
+
+
+class PersistentCacheTest(DictionaryServiceTestCase):
+    def setUp(self):
+        super().setUp()
+        self.service.normalization_cache[("it", "casa")] = "casa"
+
+    def test_failed_lookups_are_not_persisted(self):
+        no_answer = mock.patch.object(
+            self.service, "_get_romance_language_info", side_effect=lambda word, src, tgt, result, **kwargs: result
+        )
+        with no_answer:
+            info = self.service.get_word_info("casa", "it", "en")
+
+        self.assertEqual(info["source"], "none")
+        self.assertIsNone(self.service._persistent_cache.get("casa_it_en"))
+
+    def test_successful_lookups_are_persisted(self):
+        def answer(word, src, tgt, result, **kwargs):
+            return {**result, "translation": "house", "source": "mymemory"}
+
+        with mock.patch.object(self.service, "_get_romance_language_info", side_effect=answer):
+            self.service.get_word_info("casa", "it", "en")
+
+        self.assertEqual(self.service._persistent_cache.get("casa_it_en")["translation"], "house")
+
+    def test_database_lemma_takes_precedence_over_persisted_result(self):
+        self.service._persistent_cache.set("casa_it_en", {
+            "definition": "hut", "translation": "hut", "part_of_speech": "", "grammar": {},
+            "examples": [], "source": "mymemory",
+        })
+        self.service.prime_lemma_cache([
+            SimpleNamespace(lemma="casa", language="it", definition="house", pos="NOUN", morphology=None),
+        ])
+
+        info = self.service.get_word_info("casa", "it", "en", db=mock.Mock())
+
+        self.assertEqual(info["source"], "database")
+        self.assertEqual(info["translation"], "house")
+
+
+class HedgedProviderCallTest(DictionaryServiceTestCase):
+    def setUp(self):
+        super().setUp()
+        delay = mock.patch("app.services.dictionary_service._PROVIDER_HEDGE_DELAY", 0.2)
+        delay.start()
+        self.addCleanup(delay.stop)
+        self.release = threading.Event()
+        self.addCleanup(self.release.set)  # let "hanging" providers finish
+        self.calls = []
+
+    def _provider(self, name, value=None, error=False, hang=False, delay=0.0):
+        def call():
+            self.calls.append(name)
+            if hang:
+                self.release.wait(5)
+            time.sleep(delay)
+            if error:
+                raise RuntimeError(name)
+            return value
+        return call
+
+    def test_healthy_primary_is_the_only_request(self):
+        result = self.service._first_available([self._provider("a", "A"), self._provider("b", "B")])
+        self.assertEqual(result, "A")
+        self.assertEqual(self.calls, ["a"])
+
+    def test_failed_primary_falls_through_to_the_next_provider(self):
+        result = self.service._first_available([self._provider("a", error=True), self._provider("b", "B")])
+        self.assertEqual(result, "B")
+
+    def test_hanging_primary_does_not_stall_a_backup_answer(self):
+        started = time.monotonic()
+        result = self.service._first_available([self._provider("a", "A", hang=True), self._provider("b", "B")])
+        self.assertEqual(result, "B")
+        self.assertLess(time.monotonic() - started, 2.0)
+
+    def test_primary_answering_within_the_grace_period_wins(self):
+        result = self.service._first_available([self._provider("a", "A", delay=0.3), self._provider("b", "B")])
+        self.assertEqual(result, "A")
+        self.assertEqual(self.calls, ["a", "b"])
+
+
+# Saved excerpt of a WordReference it-en result table (header row, then the first entry)
+_WORDREFERENCE_HTML = """
+<table class='WRD' data-dict='iten'>
+<tr class='langHeader' style='font-size: 13px;text-decoration: none;color:#000;'><td class='FrWrd'><span class='ph' data-ph='sLang'>Italiano</span></td><td></td><td class='ToWrd' ><span class='ph' data-ph='tLang'>Inglese</span></td></tr>
+<tr class='even' id='iten:12345'><td class='FrWrd' ><strong>casa<a title="possible audio"></a></strong> <em class='tooltip POS2'>nf<span><i>sostantivo femminile</i></span></em></td><td> (abitazione) </td><td class='ToWrd' >house, home <em class='tooltip POS2'>n<span><i>noun</i></span></em></td></tr>
+</table>
+"""
+
+
+class WordReferenceParsingTest(DictionaryServiceTestCase):
+    def _respond_with(self, html):
+        self.service._http.get = mock.Mock(return_value=SimpleNamespace(status_code=200, text=html))
+
+    def test_first_translation_cell_is_extracted(self):
+        self._respond_with(_WORDREFERENCE_HTML)
+        result = self.service._get_italian_english_dict("casa", {})
+        self.assertEqual(result["translation"], "house, home")
+        self.assertEqual(result["source"], "wordreference")
+
+    def test_double_quoted_class_attribute_matches(self):
+        self._respond_with('<tr><td class="FrWrd">libro</td><td class="ToWrd">book</td></tr>')
+        self.assertEqual(self.service._get_italian_english_dict("libro", {})["translation"], "book")
+
+    def test_page_without_translation_cells_leaves_result_untouched(self):
+        self._respond_with("<tr><td class='FrWrd'><strong>casa</strong></td></tr>")
+        self.assertEqual(self.service._get_italian_english_dict("casa", {}), {})
+
+
+class FakeClock:
+    """time.monotonic/time.sleep stand-ins: sleeping advances the clock instantly."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(round(seconds, 6))
+        self.now += seconds
+
+
+class HostRateLimiterTest(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        for name in ("monotonic", "sleep"):
+            patcher = mock.patch(f"app.services.dictionary_service.time.{name}", getattr(self.clock, name))
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_burst_passes_without_sleeping_then_paces_at_the_rate(self):
+        limiter = _HostRateLimiter(delay=0.5, burst=3)  # 2 requests/second
+        for _ in range(3):
+            limiter.wait("https://a.example/x")
+        self.assertEqual(self.clock.sleeps, [])
+        limiter.wait("https://a.example/x")
+        self.assertEqual(self.clock.sleeps, [0.5])
+
+    def test_bucket_refills_over_time_up_to_burst(self):
+        limiter = _HostRateLimiter(delay=0.5, burst=3)
+        for _ in range(3):
+            limiter.wait("https://a.example/x")
+        self.clock.now += 1.0  # refills two tokens
+        limiter.wait("https://a.example/x")
+        limiter.wait("https://a.example/x")
+        self.assertEqual(self.clock.sleeps, [])
+        limiter.wait("https://a.example/x")
+        self.assertEqual(self.clock.sleeps, [0.5])
+
+        self.clock.now += 60.0  # long idle: capped at burst, not 120 tokens
+        self.clock.sleeps.clear()
+        for _ in range(4):
+            limiter.wait("https://a.example/x")
+        self.assertEqual(self.clock.sleeps, [0.5])
+
+    def test_hosts_have_independent_buckets(self):
+        limiter = _HostRateLimiter(delay=0.5, burst=2)
+        limiter.wait("https://a.example/x")
+        limiter.wait("https://a.example/y")
+        limiter.wait("https://b.example/x")
+        limiter.wait("https://b.example/y")
+        self.assertEqual(self.clock.sleeps, [])
+
+    def test_per_host_rate_override(self):
+        limiter = _HostRateLimiter(delay=0.5, burst=1, host_rates={"fast.example": 10.0})
+        limiter.wait("https://fast.example/x")
+        limiter.wait("https://fast.example/x")
+        limiter.wait("https://slow.example/x")
+        limiter.wait("https://slow.example/x")
+        self.assertEqual(self.clock.sleeps, [0.1, 0.5])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import threading
+import unittest
+
+from app.utils.lru_dict import LRUDict
+
+
+class LRUDictTest(unittest.TestCase):
+    def test_evicts_least_recently_inserted_past_maxsize(self):
+        cache = LRUDict(maxsize=2)
+        cache["a"] = 1
+        cache["b"] = 2
+        cache["c"] = 3
+        self.assertEqual(list(cache), ["b", "c"])
+        self.assertEqual(len(cache), 2)
+
+    def test_getitem_refreshes_recency(self):
+        cache = LRUDict(maxsize=2)
+        cache["a"] = 1
+        cache["b"] = 2
+        self.assertEqual(cache["a"], 1)
+        cache["c"] = 3
+        self.assertEqual(list(cache), ["a", "c"])
+
+    def test_get_refreshes_recency_and_returns_default(self):
+        cache = LRUDict(maxsize=2)
+        cache["a"] = 1
+        cache["b"] = 2
+        self.assertEqual(cache.get("a"), 1)
+        self.assertIsNone(cache.get("missing"))
+        self.assertEqual(cache.get("missing", 0), 0)
+        cache["c"] = 3
+        self.assertNotIn("b", cache)
+        self.assertIn("a", cache)
+
+    def test_overwrite_refreshes_recency_without_growing(self):
+        cache = LRUDict(maxsize=2)
+        cache["a"] = 1
+        cache["b"] = 2
+        cache["a"] = 10
+        self.assertEqual(len(cache), 2)
+        cache["c"] = 3
+        self.assertEqual(dict(cache), {"a": 10, "c": 3})
+
+    def test_pop(self):
+        cache = LRUDict(maxsize=2)
+        cache["a"] = 1
+        self.assertEqual(cache.pop("a"), 1)
+        self.assertIsNone(cache.pop("a", None))
+        with self.assertRaises(KeyError):
+            cache.pop("a")
+
+    def test_concurrent_access_stays_bounded(self):
+        cache = LRUDict(maxsize=50)
+        errors = []
+
+        def worker(offset):
+            try:
+                for i in range(2000):
+                    key = (offset + i) % 200
+                    cache[key] = i
+                    cache.get((key + 1) % 200)
+                    cache.pop((key + 2) % 200, None)
+            except Exception as exc:  # pragma: no cover - reported below
+                errors.append(exc)
+
+        threads = [threading.Thread(target=worker, args=(n * 7,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertLessEqual(len(cache), 50)
+
+
+if __name__ == "__main__":
+    unittest.main()
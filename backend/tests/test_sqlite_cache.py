@@ -0,0 +1,79 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from app.utils.sqlite_cache import SqliteCache
+
+
+class SqliteCacheTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, "cache.sqlite")
+
+    def _clock(self, now):
+        return mock.patch("app.utils.sqlite_cache.time.time", return_value=now)
+
+    def test_round_trip(self):
+        cache = SqliteCache(self.path, table="word_info")
+        value = {"translation": "house", "grammar": {"gender": "feminine"}, "examples": ["la casa"]}
+        cache.set("casa_it_en", value)
+        self.assertEqual(cache.get("casa_it_en"), value)
+        self.assertIsNone(cache.get("missing"))
+
+    def test_values_survive_reopening(self):
+        SqliteCache(self.path).set("key", [1, "è"])
+        self.assertEqual(SqliteCache(self.path).get("key"), [1, "è"])
+
+    def test_set_overwrites(self):
+        cache = SqliteCache(self.path)
+        cache.set("key", "old")
+        cache.set("key", "new")
+        self.assertEqual(cache.get("key"), "new")
+
+    def test_entries_expire_after_ttl(self):
+        cache = SqliteCache(self.path, ttl_seconds=60)
+        with self._clock(1000):
+            cache.set("key", "value")
+        with self._clock(1059):
+            self.assertEqual(cache.get("key"), "value")
+        with self._clock(1060):
+            self.assertIsNone(cache.get("key"))
+
+    def test_purge_expired_deletes_only_stale_rows(self):
+        cache = SqliteCache(self.path, ttl_seconds=60)
+        with self._clock(1000):
+            cache.set("stale", 1)
+        with self._clock(1050):
+            cache.set("fresh", 2)
+        with self._clock(1070):
+            cache.purge_expired()
+        count = cache._conn.execute(f"SELECT COUNT(*) FROM {cache.table}").fetchone()[0]
+        self.assertEqual(count, 1)
+        with self._clock(1070):
+            self.assertEqual(cache.get("fresh"), 2)
+
+    def test_purge_expired_without_ttl_is_a_no_op(self):
+        cache = SqliteCache(self.path)
+        cache.set("key", "value")
+        cache.purge_expired()
+        self.assertEqual(cache.get("key"), "value")
+
+    def test_unopenable_path_degrades_to_no_op(self):
+        cache = SqliteCache(os.path.join(self.path, "missing-dir", "cache.sqlite"))
+        cache.set("key", "value")
+        self.assertIsNone(cache.get("key"))
+        cache.purge_expired()
+
+    def test_corrupt_file_degrades_to_no_op(self):
+        with open(self.path, "wb") as f:
+            f.write(b"this is not a sqlite database" * 100)
+        cache = SqliteCache(self.path, ttl_seconds=60)
+        cache.set("key", "value")
+        self.assertIsNone(cache.get("key"))
+        cache.purge_expired()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,181 @@
+import unittest
+from unittest import mock
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.models import Base, Lemma, Token
+from app.services.comprehensive_vocabulary_processor import ComprehensiveVocabularyProcessor
+
+
+def _analysis(frequencies, language="it"):
+    """Minimal extract_all_vocabulary output: word -> frequency, one position per occurrence."""
+    vocabulary = {}
+    position = 0
+    for word, frequency in frequencies.items():
+        vocabulary[word.lower()] = {
+            'original': word,
+            '_lower': word.lower(),
+            'frequency': frequency,
+            'positions': list(range(position, position + frequency)),
+            'language': language,
+            'grammar': {},
+        }
+        position += frequency
+    return {'vocabulary': vocabulary}
+
+
+def _dictionary_service(translations=None):
+    """Identity normalization and fixed translations, without spaCy or HTTP."""
+    translations = translations or {}
+    service = mock.Mock()
+    service.normalize_word_forms.side_effect = lambda words, language: {word: word for word in words}
+    service.get_word_info.side_effect = lambda lemma, language, target, db=None: {
+        'translation': translations.get(lemma, ''),
+    }
+    return service
+
+
+class VocabularySaveTestCase(unittest.TestCase):
+    """In-memory SQLite database with the app schema (unique lemma index included)."""
+
+    def setUp(self):
+        self.engine = create_engine(
+            "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+        )
+        Base.metadata.create_all(self.engine)
+        self.addCleanup(self.engine.dispose)
+        self.db = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)()
+        self.addCleanup(self.db.close)
+        self.processor = ComprehensiveVocabularyProcessor()
+        spacy = mock.patch.object(self.processor, "_get_spacy_model", return_value=None)
+        spacy.start()
+        self.addCleanup(spacy.stop)
+
+    def save(self, frequencies, book_id=1, translations=None):
+        self.processor.save_comprehensive_analysis_with_lemmatization(
+            _analysis(frequencies), book_id, "it", self.db, _dictionary_service(translations)
+        )
+
+    def lemma_ids(self):
+        return {lemma: id_ for id_, lemma in self.db.query(Lemma.id, Lemma.lemma).filter(Lemma.language == "it")}
+
+    def tokens(self, book_id):
+        return self.db.query(Token.original_token, Token.lemma_id).filter(Token.book_id == book_id).all()
+
+
+class SaveLoopTest(VocabularySaveTestCase):
+    def test_first_save_links_every_token_to_a_lemma(self):
+        self.save({"casa": 3, "libro": 2, "mare": 1}, translations={"casa": "house"})
+
+        ids = self.lemma_ids()
+        self.assertEqual(set(ids), {"casa", "libro", "mare"})
+        tokens = self.tokens(1)
+        self.assertEqual(len(tokens), 6)
+        self.assertEqual(self.db.query(Token).filter(Token.lemma_id.is_(None)).count(), 0)
+        for original_token, lemma_id in tokens:
+            self.assertEqual(lemma_id, ids[original_token])
+        self.assertEqual(self.db.query(Lemma.definition).filter(Lemma.lemma == "casa").scalar(), "house")
+
+    def test_resave_reuses_existing_lemma_ids(self):
+        self.save({"casa": 3, "libro": 2}, book_id=1)
+        first_ids = self.lemma_ids()
+
+        self.save({"casa": 1, "libro": 4, "mare": 2}, book_id=2)
+
+        ids = self.lemma_ids()
+        self.assertEqual(self.db.query(Lemma).count(), 3)
+        self.assertEqual(ids["casa"], first_ids["casa"])
+        self.assertEqual(ids["libro"], first_ids["libro"])
+        for original_token, lemma_id in self.tokens(2):
+            self.assertEqual(lemma_id, ids[original_token])
+        # Frequency is never lowered by a later, smaller count
+        self.assertEqual(self.db.query(Lemma.global_frequency).filter(Lemma.lemma == "casa").scalar(), 3)
+
+    def test_session_expiry_setting_is_restored(self):
+        self.save({"casa": 1})
+        self.assertTrue(self.db.expire_on_commit)
+
+    def test_batches_written_mid_run_resolve_token_lemma_ids(self):
+        with mock.patch("app.services.comprehensive_vocabulary_processor._WRITE_BATCH", 2):
+            self.save({"casa": 1, "libro": 1, "mare": 1, "sole": 1, "luna": 1})
+
+        ids = self.lemma_ids()
+        self.assertEqual(len(ids), 5)
+        for original_token, lemma_id in self.tokens(1):
+            self.assertEqual(lemma_id, ids[original_token])
+
+
+class LemmaUpsertTest(VocabularySaveTestCase):
+    def _insert_behind_prefetch(self):
+        """A row written by another process after this run's prefetch: the run only sees it on INSERT."""
+        self.db.add(Lemma(lemma="casa", language="it", pos="NOUN", definition="house", global_frequency=10))
+        self.db.commit()
+        existing_id = self.lemma_ids()["casa"]
+        prefetch = mock.patch.object(self.processor, "_load_existing_lemmas", return_value={})
+        prefetch.start()
+        self.addCleanup(prefetch.stop)
+        return existing_id
+
+    def test_conflicting_insert_updates_the_existing_row(self):
+        existing_id = self._insert_behind_prefetch()
+
+        self.save({"casa": 4})
+
+        row = self.db.query(Lemma).filter(Lemma.lemma == "casa").one()
+        self.assertEqual(row.id, existing_id)
+        # Empty new definition keeps the stored one; frequency keeps the larger value
+        self.assertEqual(row.definition, "house")
+        self.assertEqual(row.global_frequency, 10)
+        self.assertEqual({lemma_id for _, lemma_id in self.tokens(1)}, {existing_id})
+
+    def test_conflicting_insert_overwrites_with_a_new_definition(self):
+        self._insert_behind_prefetch()
+
+        self.save({"casa": 12}, translations={"casa": "home"})
+
+        row = self.db.query(Lemma).filter(Lemma.lemma == "casa").one()
+        self.assertEqual(row.definition, "home")
+        self.assertEqual(row.global_frequency, 12)
+
+    def test_ids_are_requeried_when_the_dialect_lacks_executemany_returning(self):
+        with mock.patch.object(self.engine.dialect, "insert_executemany_returning", False):
+            self.save({"casa": 2, "libro": 1})
+
+        ids = self.lemma_ids()
+        self.assertEqual(len(self.tokens(1)), 3)
+        for original_token, lemma_id in self.tokens(1):
+            self.assertEqual(lemma_id, ids[original_token])
+
+
+class NonUniqueLemmaIndexTest(VocabularySaveTestCase):
+    """Databases migrated with duplicate lemmas keep a plain (lemma, language) index."""
+
+    def setUp(self):
+        super().setUp()
+        with self.engine.begin() as conn:
+            conn.execute(text("DROP INDEX ix_lemmas_lemma_language"))
+            conn.execute(text("CREATE INDEX ix_lemmas_lemma_language ON lemmas(lemma, language)"))
+
+    def test_plain_insert_is_used_and_tokens_are_linked(self):
+        self.save({"casa": 2, "libro": 1})
+
+        self.assertFalse(self.processor._lemma_upsert_supported)
+        ids = self.lemma_ids()
+        self.assertEqual(set(ids), {"casa", "libro"})
+        for original_token, lemma_id in self.tokens(1):
+            self.assertEqual(lemma_id, ids[original_token])
+
+    def test_resave_reuses_existing_lemma_ids(self):
+        self.save({"casa": 2}, book_id=1)
+        self.save({"casa": 1, "libro": 1}, book_id=2)
+
+        self.assertEqual(self.db.query(Lemma).filter(Lemma.lemma == "casa").count(), 1)
+        ids = self.lemma_ids()
+        for original_token, lemma_id in self.tokens(2):
+            self.assertEqual(lemma_id, ids[original_token])
+
+
+if __name__ == "__main__":
+    unittest.main()